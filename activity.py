@@ -0,0 +1,220 @@
+"""
+Per-user log of compatibility checks and searches, written behind the requests.
+
+The activity table follows the shape of transactions (user_id, date), and
+both get an index on (user_id, date) so a user's recent rows are one index
+range scan. Pages of recent() are keyset-paginated: the cursor is the id of
+the last row seen, never an OFFSET.
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import sqlite3
+import sys
+import threading
+import weakref
+from collections import deque
+from datetime import datetime, timezone
+from itertools import chain
+
+from database import Database
+from metrics import timed
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(user_id) REFERENCES users(id)
+);
+CREATE INDEX IF NOT EXISTS activity_user_date ON activity (user_id, date);
+"""
+# transactions existe desde el principio en finance.db pero no tenia indice; /api/portfolio la filtra por user_id
+TRANSACTIONS_INDEX = "CREATE INDEX IF NOT EXISTS transactions_user_date ON transactions (user_id, date)"
+
+
+def _now():
+    # El formato de CURRENT_TIMESTAMP con microsegundos: ordena como texto y guarda la hora del evento, no la de la escritura
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def create_schema(db):
+    """Create the activity table and the (user_id, date) indexes in db (a Database)."""
+    with db.connection() as connection:
+        connection.executescript(SCHEMA)
+        if connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'").fetchone():
+            connection.execute(TRANSACTIONS_INDEX)
+
+
+class ActivityLog:
+    """
+    Write-behind log of what each user did, in the activity table.
+
+    With mode="buffered" log() only appends to an in-memory buffer. A
+    background thread writes it in one transaction of multi-row INSERTs per batch, as soon
+    as `batch_size` events are waiting or at most `interval` seconds later, so
+    no request waits on the disk. That costs durability: the events still in
+    the buffer are lost if the process dies, and while `buffer_size` events
+    are waiting new ones are dropped and counted. `synchronous` is the
+    PRAGMA of the writer's connection; "FULL" makes every batch durable on
+    disk once written. mode="sync" writes each event inside the request and
+    mode="off" writes nothing.
+    """
+
+    INSERT = "INSERT INTO activity (user_id, kind, detail, date) VALUES "
+    RECENT = ("SELECT id, kind, detail, date FROM activity WHERE user_id = ? "
+              "ORDER BY date DESC, id DESC LIMIT ?")
+    # (date, id) del cursor con la misma fila del usuario; un cursor de otro usuario no devuelve nada
+    RECENT_BEFORE = ("SELECT id, kind, detail, date FROM activity WHERE user_id = ? "
+                     "AND (date, id) < (SELECT date, id FROM activity WHERE id = ? AND user_id = ?) "
+                     "ORDER BY date DESC, id DESC LIMIT ?")
+
+    def __init__(self, db, mode="buffered", batch_size=256, interval=1.0, buffer_size=10_000, synchronous="NORMAL"):
+        if mode not in ("buffered", "sync", "off"):
+            raise ValueError(f"unknown activity log mode: {mode!r}")
+        self.db = db
+        self.mode = mode
+        self.batch_size = batch_size
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.synchronous = synchronous
+        self.written = 0
+        self.dropped = 0
+        create_schema(db)
+
+        self._reset()
+        _logs.add(self)
+
+    def _reset(self):
+        self._buffer = deque()
+        self._wakeup = threading.Condition()
+        self._thread = None
+        self._closing = False
+        self._writer = None
+
+    def writer(self):
+        """The Database the events are written with, opened by the process that writes."""
+        with self._wakeup:
+            if self._writer is None:
+                self._writer = Database(self.db.path, pool_size=2, synchronous=self.synchronous)
+            return self._writer
+
+    def log(self, user_id, kind, **detail):
+        """Record that user_id did `kind` ("compatibility", "search"); detail is stored as JSON."""
+        if self.mode == "off":
+            return
+        event = (user_id, kind, json.dumps(detail, separators=(",", ":")), _now())
+        if self.mode == "sync":
+            self._write([event])
+            return
+
+        with self._wakeup:
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return
+            self._buffer.append(event)
+            if self._thread is None:
+                # el hilo hereda el contexto de la peticion, y con el el ajuste de metricas de su app
+                self._thread = threading.Thread(target=contextvars.copy_context().run, args=(self._run,),
+                                                name="activity-writer", daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                self._wakeup.wait_for(lambda: len(self._buffer) >= self.batch_size or self._closing, self.interval)
+                batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.batch_size))]
+                done = self._closing and not self._buffer
+            if batch:
+                self._write(batch)
+            if done:
+                return
+
+    @timed("activity.write")
+    def _write(self, events):
+        """
+        One transaction for all of events, one INSERT per as many rows as
+        SQLite takes variables; a batch that can't be written is counted as
+        dropped.
+        """
+        try:
+            writer = self.writer()
+            with writer.transaction(), writer.connection() as connection:
+                # 4 variables por fila; sin getlimit() (Python < 3.11) se supone el minimo historico de SQLite, 999
+                variables = (connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+                             if hasattr(connection, "getlimit") else 999)
+                per_insert = max(variables // 4, 1)
+                for start in range(0, len(events), per_insert):
+                    rows = events[start:start + per_insert]
+                    writer.execute(self.INSERT + ", ".join(["(?, ?, ?, ?)"] * len(rows)), *chain.from_iterable(rows))
+        except Exception as e:          # el hilo escritor no debe morir por un lote
+            print(f"Activity log error: {e}", file=sys.stderr)
+            with self._wakeup:
+                self.dropped += len(events)
+            return
+        with self._wakeup:
+            self.written += len(events)
+
+    def flush(self):
+        """Write everything buffered so far, from the calling thread."""
+        with self._wakeup:
+            events = list(self._buffer)
+            self._buffer.clear()
+        for start in range(0, len(events), self.batch_size):
+            self._write(events[start:start + self.batch_size])
+
+    def close(self):
+        """Stop the writer thread once the buffer is written; called at exit for every live log."""
+        with self._wakeup:
+            self._closing = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(self.interval + 5)
+        self.flush()
+
+    def recent(self, user_id, before=None, limit=50):
+        """
+        Up to `limit` events of user_id, newest first, and the cursor of the
+        next page (None on the last one). `before` is the cursor of the
+        previous page: the id of its last event.
+        """
+        if before is None:
+            rows = self.db.execute(self.RECENT, user_id, limit + 1)
+        else:
+            rows = self.db.execute(self.RECENT_BEFORE, user_id, before, user_id, limit + 1)
+        events = [{**row, "detail": json.loads(row["detail"])} for row in rows[:limit]]
+        return events, events[-1]["id"] if len(rows) > limit else None
+
+    def lines(self):
+        """Exposition lines for /metrics."""
+        yield "# TYPE app_activity_events_total counter"
+        yield f'app_activity_events_total{{outcome="written"}} {self.written}'
+        yield f'app_activity_events_total{{outcome="dropped"}} {self.dropped}'
+        yield "# TYPE app_activity_buffered gauge"
+        yield f"app_activity_buffered {len(self._buffer)}"
+
+
+# Los ganchos se registran una vez por proceso, no uno por log: cada app creada anadiria otro y la retendria para siempre
+_logs = weakref.WeakSet()
+
+
+def _after_fork():
+    for log in list(_logs):
+        log._reset()                # el hijo no hereda el hilo escritor ni sus conexiones
+
+
+def _close_all():
+    for log in list(_logs):
+        log.close()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(_close_all)
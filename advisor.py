@@ -0,0 +1,176 @@
+"""
+Upgrade advice over the catalog: the single CPU, GPU or RAM step that
+unlocks the most games, and the smallest upgrade a given game still needs.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from hardware import cpu_ranking, gpu_ranking
+from metrics import timed
+
+
+class Dominance:
+    """
+    Number of points (x, y, z) with x < X, y < Y and z <= Z, for any (X, Y, Z).
+
+    Counts come from a cumulative table over the distinct coordinates, so a
+    query is three bisects and one lookup whatever the number of points.
+    """
+
+    def __init__(self, points):
+        self.xs = sorted({x for x, _, _ in points})
+        self.ys = sorted({y for _, y, _ in points})
+        self.zs = sorted({z for _, _, z in points})
+        nx, ny, nz = len(self.xs) + 1, len(self.ys) + 1, len(self.zs) + 1
+        self._strides = (ny * nz, nz)
+        table = [0] * (nx * ny * nz)
+        for x, y, z in points:
+            table[((bisect_left(self.xs, x) + 1) * ny + bisect_left(self.ys, y) + 1) * nz + bisect_left(self.zs, z) + 1] += 1
+
+        # Suma acumulada en cada eje: la celda (i, j, k) cuenta los puntos con indices menores que i, j y k
+        for stride, size in ((1, nz), (nz, ny), (ny * nz, nx)):
+            for index in range(len(table)):
+                if (index // stride) % size:
+                    table[index] += table[index - stride]
+        self._table = table
+
+    def count(self, x, y, z):
+        i, j, k = bisect_left(self.xs, x), bisect_left(self.ys, y), bisect_right(self.zs, z)
+        return self._table[i * self._strides[0] + j * self._strides[1] + k]
+
+
+def _parts(ranking):
+    """(tier, key, name) of every part in a hierarchy, cheapest first, one name per key."""
+    parts = {}
+    for name, tier in sorted(ranking.hierarchy.items(), key=lambda item: item[1]):
+        key = ranking.key(name)
+        parts.setdefault(key, (tier, key, name))
+    return sorted(parts.values())
+
+
+class UpgradeAdvisor:
+    """
+    Precomputed answers to "what should I upgrade" for one catalog version.
+
+    A rig runs a game with GameRepository.compatible's rule: each part has a
+    higher tier than required or is the same part, and there is enough RAM.
+    The compatible games of any rig are then counted in four disjoint
+    groups: lower tier on both parts, same CPU, same GPU, and both the same.
+    Each group has its own Dominance table. Only parts that can change a
+    count are tried as upgrades: the cheapest part above each tier some
+    game requires, and every part some game names.
+    """
+
+    def __init__(self, games):
+        self.games = {game.id: game for game in games}
+        self.total = len(self.games)
+        self._lower = Dominance([(game.cpu_tier, game.gpu_tier, game.ram) for game in self.games.values()])
+
+        same_cpu, same_gpu, same_both = {}, {}, {}
+        for game in self.games.values():
+            same_cpu.setdefault(game.cpu_key, []).append((0, game.gpu_tier, game.ram))
+            same_gpu.setdefault(game.gpu_key, []).append((game.cpu_tier, 0, game.ram))
+            same_both.setdefault((game.cpu_key, game.gpu_key), []).append(game.ram)
+        self._same_cpu = {key: Dominance(points) for key, points in same_cpu.items()}
+        self._same_gpu = {key: Dominance(points) for key, points in same_gpu.items()}
+        self._same_both = {key: sorted(rams) for key, rams in same_both.items()}
+
+        self.cpu_parts = _parts(cpu_ranking)
+        self.gpu_parts = _parts(gpu_ranking)
+        self.cpu_steps = self._steps(self.cpu_parts, {game.cpu_tier for game in self.games.values()}, same_cpu)
+        self.gpu_steps = self._steps(self.gpu_parts, {game.gpu_tier for game in self.games.values()}, same_gpu)
+        self.ram_steps = sorted({game.ram for game in self.games.values()})
+
+    @staticmethod
+    def _steps(parts, tiers, keys):
+        """The parts worth trying as an upgrade, cheapest first."""
+        ranks = [tier for tier, _, _ in parts]
+        steps = {part for part in parts if part[1] in keys}
+        for tier in tiers:
+            above = bisect_right(ranks, tier)
+            if above < len(parts):
+                steps.add(parts[above])
+        return sorted(steps)
+
+    def count(self, cpu_key, cpu_tier, gpu_key, gpu_tier, ram):
+        """How many games run on a resolved rig."""
+        total = self._lower.count(cpu_tier, gpu_tier, ram)
+        if cpu_key in self._same_cpu:
+            total += self._same_cpu[cpu_key].count(1, gpu_tier, ram)
+        if gpu_key in self._same_gpu:
+            total += self._same_gpu[gpu_key].count(cpu_tier, 1, ram)
+        if (cpu_key, gpu_key) in self._same_both:
+            total += bisect_right(self._same_both[cpu_key, gpu_key], ram)
+        return total
+
+    @timed("advisor.advise")
+    def advise(self, cpu, gpu, ram, unlock=None):
+        """
+        Single-part upgrades for the rig (cpu, gpu, ram).
+
+        For each part the answer is its Pareto frontier: the options, cheapest
+        first, that each unlock more games than every cheaper one. "best" is
+        the option unlocking the most games overall, and with unlock=N
+        "cheapest" holds, per part, the first option unlocking at least N.
+        """
+        cpu_key, cpu_tier = cpu_ranking.resolve(cpu)
+        gpu_key, gpu_tier = gpu_ranking.resolve(gpu)
+        ram = int(ram)
+        current = self.count(cpu_key, cpu_tier, gpu_key, gpu_tier, ram)
+
+        def frontier(options):
+            best, steps = current, []
+            for tier, name, runs in options:
+                if runs > best:
+                    steps.append({"name": name, "tier": tier, "unlocks": runs - current})
+                    best = runs
+            return steps
+
+        advice = {
+            "current": current,
+            "total": self.total,
+            "cpu": frontier((tier, name, self.count(key, tier, gpu_key, gpu_tier, ram))
+                            for tier, key, name in self.cpu_steps if tier >= cpu_tier and key != cpu_key),
+            "gpu": frontier((tier, name, self.count(cpu_key, cpu_tier, key, tier, ram))
+                            for tier, key, name in self.gpu_steps if tier >= gpu_tier and key != gpu_key),
+            "ram": frontier((step, step, self.count(cpu_key, cpu_tier, gpu_key, gpu_tier, step))
+                            for step in self.ram_steps if step > ram),
+        }
+        options = [{"part": part, **advice[part][-1]} for part in ("cpu", "gpu", "ram") if advice[part]]
+        advice["best"] = max(options, key=lambda option: option["unlocks"], default=None)
+        if unlock is not None:
+            advice["cheapest"] = {
+                part: next((step for step in advice[part] if step["unlocks"] >= unlock), None)
+                for part in ("cpu", "gpu", "ram")
+            }
+        return advice
+
+    @timed("advisor.needs")
+    def needs(self, cpu, gpu, ram, game_id):
+        """
+        The smallest upgrade that lets the rig run game_id, part by part.
+
+        Each of "cpu", "gpu" and "ram" is None when that part is already
+        enough. A part no entry of the hierarchy can satisfy is reported as
+        {"name": None}. Raises KeyError for an unknown game.
+        """
+        game = self.games[game_id]
+        cpu_key, cpu_tier = cpu_ranking.resolve(cpu)
+        gpu_key, gpu_tier = gpu_ranking.resolve(gpu)
+        return {
+            "game": game.to_json(),
+            "cpu": None if game.cpu_tier < cpu_tier or game.cpu_key == cpu_key
+            else self._cheapest(self.cpu_parts, game.cpu_key, game.cpu_tier),
+            "gpu": None if game.gpu_tier < gpu_tier or game.gpu_key == gpu_key
+            else self._cheapest(self.gpu_parts, game.gpu_key, game.gpu_tier),
+            "ram": None if game.ram <= int(ram) else {"name": game.ram, "tier": game.ram},
+        }
+
+    @staticmethod
+    def _cheapest(parts, key, tier):
+        """The required part itself if the hierarchy has it, or else the cheapest part above its tier."""
+        start = bisect_left(parts, (tier,))
+        for part_tier, part_key, name in parts[start:]:
+            if part_key == key or part_tier > tier:
+                return {"name": name, "tier": part_tier}
+        return {"name": None, "tier": None}
@@ -0,0 +1,125 @@
+"""
+ASGI serving mode, for the routes that wait on the quote API.
+
+    uvicorn asgi:application --workers 4
+
+The routes in AsyncApp.routes run on the event loop. They await their
+quotes from AsyncQuoteClient, and their SQLite reads and session loads go to
+a small thread pool, so a slow upstream call holds a coroutine instead of a
+worker. Every other request goes to the Flask app unchanged, run by a2wsgi
+on ASGI_SYNC_THREADS threads. Needs aiohttp, a2wsgi and an ASGI server such
+as uvicorn; "gunicorn app:app" keeps serving everything synchronously.
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+import metrics
+from app import HOLDINGS, app, portfolio, resources
+from caching import NO_STORE
+from quotes import QUOTES_URL, AsyncQuoteClient
+
+
+class AsyncApp:
+    """
+    ASGI app answering `routes` on the event loop and everything else with
+    flask_app. Each async route shares its path, arguments and JSON with the
+    Flask view of the same name, which keeps serving it under WSGI.
+    """
+
+    def __init__(self, flask_app):
+        config = flask_app.config
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=config["ASGI_SYNC_THREADS"])
+        self.executor = ThreadPoolExecutor(config["ASGI_DB_THREADS"], thread_name_prefix="asgi-db")
+        self.quotes = None          # se crea en el event loop que lo va a usar, en la primera peticion
+        self.metrics = flask_app.extensions.get("metrics", False)
+        self.routes = {
+            ("GET", "/api/quote"): self.api_quote,
+            ("GET", "/api/portfolio"): self.api_portfolio,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        handler = self.routes.get((scope["method"], scope["path"])) if scope["type"] == "http" else None
+        if handler is None:
+            return await self.wsgi(scope, receive, send)
+
+        start = time.perf_counter()
+        metrics.recording.set(self.metrics)         # cada peticion corre en su propia tarea, con su copia del contexto
+        status, payload = await handler(scope)
+        body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+        await send({"type": "http.response.start", "status": status, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cache-control", NO_STORE.encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+        if self.metrics:
+            metrics.request_seconds.observe(time.perf_counter() - start, handler.__name__, scope["method"], status)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.quotes is not None:
+                    await self.quotes.aclose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def client(self):
+        if self.quotes is None:
+            concurrency = self.flask_app.config["QUOTES_CONCURRENCY"]
+            self.quotes = AsyncQuoteClient(QUOTES_URL, pool_size=concurrency, concurrency=concurrency)
+        return self.quotes
+
+    def run(self, f, *args):
+        """Await f(*args) on the database threads."""
+        return asyncio.get_running_loop().run_in_executor(self.executor, f, *args)
+
+    def user_id(self, scope):
+        """user_id in the session of the request, loaded by the app's session interface (a query with SESSION_BACKEND=sqlite)."""
+        environ = {"REQUEST_METHOD": scope["method"], "PATH_INFO": scope["path"], "QUERY_STRING": "",
+                   "SERVER_NAME": "localhost", "SERVER_PORT": "80", "wsgi.url_scheme": scope.get("scheme", "http")}
+        cookies = [value.decode("latin1") for name, value in scope["headers"] if name == b"cookie"]
+        if cookies:
+            environ["HTTP_COOKIE"] = "; ".join(cookies)
+        with self.flask_app.app_context():
+            session = self.flask_app.session_interface.open_session(self.flask_app, self.flask_app.request_class(environ))
+        return session.get("user_id") if session is not None else None
+
+    def holdings(self, user_id):
+        return resources(self.flask_app).db.execute(HOLDINGS, user_id)
+
+    async def api_quote(self, scope):
+        """Latest quote for ?symbol=, awaited; logged-in users only."""
+        if await self.run(self.user_id, scope) is None:
+            return 401, {"error": "login required"}
+        symbol = parse_qs(scope["query_string"].decode("latin1")).get("symbol", [""])[0].strip()
+        if not symbol:
+            return 400, {"error": "expected ?symbol="}
+        quote = await self.client().lookup(symbol)
+        if quote is None:
+            return 404, {"error": f"no quote for {symbol.upper()}"}
+        return 200, quote
+
+    async def api_portfolio(self, scope):
+        """The logged-in user's holdings, read on the database threads and valued with concurrent lookups."""
+        user_id = await self.run(self.user_id, scope)
+        if user_id is None:
+            return 401, {"error": "login required"}
+        holdings = await self.run(self.holdings, user_id)
+        quotes = await self.client().lookup_many(holding["symbol"] for holding in holdings)
+        return 200, portfolio(holdings, quotes)
+
+
+application = AsyncApp(app)         # la app por defecto, para "uvicorn asgi:application"
@@ -0,0 +1,262 @@
+"""
+Build-time asset pipeline and the static view that serves its output.
+
+    python assets.py [path/to/static]
+
+build_assets() writes, under the static folder:
+
+- thumbs/<name>.jpg (or .png for images with transparency) and
+  thumbs/<name>.webp, fitted into THUMBNAIL_SIZE, for every cover in images/;
+- <file>.gz and <file>.br next to every text asset (CSS, JS, SVG, HTML),
+  unless compressing doesn't make it smaller;
+- manifest.json, with the content hash of every file and its variants.
+
+Outputs whose source hash is unchanged since the last build are kept as they
+are. Pillow (thumbnails) and brotli (.br files) are optional; without them
+those outputs are skipped.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import sys
+import time
+from functools import lru_cache
+
+from flask import current_app, request, send_from_directory
+
+from cache import LRUCache
+
+try:
+    import brotli
+except ImportError:     # sin brotli solo se generan y se sirven variantes gzip
+    brotli = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:     # sin Pillow no se generan miniaturas y las plantillas usan la imagen original
+    Image = None
+
+
+MANIFEST = "manifest.json"
+THUMBNAIL_SIZE = (300, 400)             # el doble de los 150px con los que se muestran, para pantallas de alta densidad
+TEXT_TYPES = (".css", ".js", ".svg", ".html", ".txt")
+IMAGE_TYPES = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE = ("text/html", "text/css", "text/plain", "application/json", "application/javascript", "image/svg+xml")
+MIN_SIZE = 1024                         # bytes; por debajo de esto comprimir no compensa las cabeceras
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def _compress(data, encoding, quality):
+    """data compressed with encoding; quality runs from 1 (fast) to 11 (smallest)."""
+    if encoding == "br":
+        return brotli.compress(data, quality=quality)
+    return gzip.compress(data, compresslevel=min(quality, 9), mtime=0)
+
+
+def _thumbnail(data, name):
+    """(fallback filename, fallback bytes, webp bytes, size) for an image."""
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(THUMBNAIL_SIZE)
+        stem = os.path.splitext(name)[0]
+        fallback = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            image.save(fallback, "PNG", optimize=True)
+            filename = f"thumbs/{stem}.png"
+        else:
+            image.convert("RGB").save(fallback, "JPEG", quality=80, optimize=True, progressive=True)
+            filename = f"thumbs/{stem}.jpg"
+        webp = io.BytesIO()
+        image.save(webp, "WEBP", quality=75, method=6)
+        return filename, fallback.getvalue(), webp.getvalue(), image.size
+
+
+def build_assets(folder):
+    """Run the pipeline over the static folder at `folder`; returns the new manifest."""
+    path = os.path.join(folder, MANIFEST)
+    try:
+        with open(path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {"files": {}, "thumbnails": {}}
+    manifest = {"files": {}, "thumbnails": {}}
+
+    for directory, _, names in os.walk(folder):
+        for name in sorted(names):
+            filename = os.path.relpath(os.path.join(directory, name), folder).replace(os.sep, "/")
+            if filename == MANIFEST or filename.startswith("thumbs/") or name.endswith((".gz", ".br", ".tmp")):
+                continue
+            with open(os.path.join(folder, filename), "rb") as f:
+                data = f.read()
+            source = _digest(data)
+            entry = {"hash": source, "encodings": {}}
+
+            if name.endswith(TEXT_TYPES):
+                old = previous["files"].get(filename, {})
+                for encoding, suffix in ENCODINGS.items():
+                    if encoding == "br" and brotli is None:
+                        continue
+                    variant = filename + suffix
+                    if old.get("hash") == source:
+                        if variant in old.get("encodings", {}).values() and os.path.exists(os.path.join(folder, variant)):
+                            entry["encodings"][encoding] = variant
+                            continue
+                        if encoding in old.get("incompressible", ()):
+                            entry.setdefault("incompressible", []).append(encoding)
+                            continue
+                    compressed = _compress(data, encoding, 11)
+                    if len(compressed) < len(data):
+                        _write(os.path.join(folder, variant), compressed)
+                        entry["encodings"][encoding] = variant
+                    else:
+                        entry.setdefault("incompressible", []).append(encoding)     # no se vuelve a intentar mientras no cambie
+            manifest["files"][filename] = entry
+
+            if Image is not None and filename.startswith("images/") and name.lower().endswith(IMAGE_TYPES):
+                thumbnail = previous["thumbnails"].get(filename)
+                old = previous["files"].get(thumbnail, {}) if thumbnail else {}
+                if old.get("source") == source and all(
+                        os.path.exists(os.path.join(folder, output)) for output in (thumbnail, *old["types"].values())):
+                    manifest["files"][thumbnail] = old
+                else:
+                    thumbnail, fallback, webp, size = _thumbnail(data, name)
+                    webp_name = os.path.splitext(thumbnail)[0] + ".webp"
+                    _write(os.path.join(folder, thumbnail), fallback)
+                    _write(os.path.join(folder, webp_name), webp)
+                    manifest["files"][thumbnail] = {
+                        "hash": _digest(fallback + webp), "source": source, "size": list(size),
+                        "encodings": {}, "types": {"image/webp": webp_name},
+                    }
+                manifest["thumbnails"][filename] = thumbnail
+
+    _write(path, json.dumps(manifest, indent=1, sort_keys=True).encode())
+    return manifest
+
+
+@lru_cache(maxsize=4)
+def _load_manifest(path, mtime):
+    with open(path) as f:
+        return json.load(f)
+
+
+def manifest():
+    """The manifest of the app's static folder, reread only when the file changes; empty before the first build."""
+    path = os.path.join(current_app.static_folder, MANIFEST)
+    try:
+        return _load_manifest(path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return {"files": {}, "thumbnails": {}}
+
+
+def thumbnail(filename):
+    """Static filename of the thumbnail built for filename, or filename itself if there is none."""
+    return manifest()["thumbnails"].get(filename, filename)
+
+
+def accepts(mimetype):
+    """Whether the client named mimetype explicitly in Accept; */* alone doesn't count."""
+    return any(value == mimetype and quality > 0 for value, quality in request.accept_mimetypes)
+
+
+def send_static(filename):
+    """
+    Flask's static view, choosing among the variants in the manifest.
+
+    A WebP thumbnail is sent to clients that accept image/webp, and a .br or
+    .gz file to those that accept that encoding. Files go out through
+    send_from_directory, so under a server with wsgi.file_wrapper (gunicorn)
+    they are sent with sendfile() instead of being copied through Python.
+    """
+    entry = manifest()["files"].get(filename)
+    if entry is None:
+        return current_app.send_static_file(filename)
+
+    path = filename
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    vary = []
+    if "types" in entry:
+        vary.append("Accept")
+        for variant_type, variant in entry["types"].items():
+            if accepts(variant_type):
+                path, mimetype = variant, variant_type
+                break
+
+    encoding = None
+    if entry["encodings"]:
+        vary.append("Accept-Encoding")
+        encoding = next((name for name in ENCODINGS if name in entry["encodings"] and request.accept_encodings[name]), None)
+        if encoding is not None:
+            path = entry["encodings"][encoding]
+
+    response = send_from_directory(current_app.static_folder, path, mimetype=mimetype,
+                                   max_age=current_app.get_send_file_max_age(filename))
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    for header in vary:
+        response.vary.add(header)
+    return response
+
+
+# Respuestas comprimidas por (hash del cuerpo, codificacion). No se usa el ETag como clave: una pagina con
+# mensajes flash o con plantillas nuevas cambia de cuerpo sin que cambie el ETag del catalogo
+compressed = LRUCache(256)
+
+
+def compress_response(response):
+    """
+    Compress an HTML or JSON response with the best encoding the client accepts.
+
+    Responses with an ETag are compressed once at high quality and reused from
+    `compressed`, keyed by a digest of the body; their ETag becomes weak, so
+    it still matches across encodings. Streamed and file responses are left
+    alone.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = next((name for name in ENCODINGS if (name != "br" or brotli) and request.accept_encodings[name]), None)
+    data = response.get_data()
+    if encoding is None or len(data) < MIN_SIZE:
+        return response
+
+    etag, _ = response.get_etag()
+    if etag is None:
+        body = _compress(data, encoding, 4)
+    else:
+        key = (hashlib.blake2b(data, digest_size=16).digest(), encoding)
+        body = compressed.get(key)
+        if body is None:
+            body = _compress(data, encoding, 9)
+            compressed.put(key, body)
+        response.set_etag(etag, weak=True)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_assets(app):
+    """Serve app's static folder through send_static."""
+    app.view_functions["static"] = send_static
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    result = build_assets(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "static"))
+    print(f"{len(result['files'])} files, {len(result['thumbnails'])} thumbnails in {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,111 @@
+"""Password hashing off the request threads, with admission control and login throttling."""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
+
+from werkzeug.exceptions import ServiceUnavailable, TooManyRequests
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from cache import LRUCache
+
+
+HASH_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasher:
+    """
+    Run werkzeug's password KDFs on a small process pool.
+
+    At most `workers` hashes run at once and `queue_size` more may wait; past
+    that, calls fail straight away with 503 and a Retry-After header instead
+    of tying up another request thread. With workers=0 hashing runs inline.
+    """
+
+    def __init__(self, workers=2, queue_size=16, method=HASH_METHOD, retry_after=1):
+        self.workers = workers
+        self.method = method
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def hash(self, password):
+        """Hash password with the configured method."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def check(self, pwhash, password):
+        """True if password matches pwhash."""
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True if pwhash was made with a method or parameters other than the configured ones."""
+        return pwhash.split("$", 1)[0] != self._prefix
+
+    @cached_property
+    def _prefix(self):
+        # werkzeug completa los atajos ("scrypt", "pbkdf2"): el prefijo real sale de un hash hecho con el metodo configurado
+        return generate_password_hash("", self.method).split("$", 1)[0]
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ServiceUnavailable("Too many sign-ins in progress, try again shortly.", retry_after=self.retry_after)
+        try:
+            executor = self._pool()
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                self._discard(executor)         # un proceso del pool murio: se crea otro y se reintenta una vez
+                return self._pool().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: un fork desde un worker con hilos podria heredar locks tomados por otro hilo
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _discard(self, executor):
+        """Forget a broken pool, unless another thread already replaced it."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+
+class TokenBuckets:
+    """
+    One token bucket per key: `burst` tokens, refilled at `rate` per second.
+
+    Only the `maxsize` most recently seen keys are tracked; a forgotten key
+    starts again with a full bucket.
+    """
+
+    def __init__(self, rate, burst, maxsize=10000):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        """Spend a token for key; raise 429 with Retry-After if the bucket is empty."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp = self._buckets.get(key) or (self.burst, now)
+            tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+            if tokens < 1:
+                self._buckets.put(key, (tokens, now))
+                raise TooManyRequests("Too many login attempts, try again later.",
+                                      retry_after=int((1 - tokens) / self.rate) + 1)
+            self._buckets.put(key, (tokens - 1, now))
@@ -0,0 +1,86 @@
+"""Vectorized compatibility checks for many rigs at once (needs NumPy)."""
+
+np = None           # se importa en la primera llamada a load_numpy(); False si no esta instalado
+
+
+def load_numpy():
+    """Import NumPy on first use; returns the module, or None if it isn't installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:     # NumPy es opcional: sin el, GameRepository resuelve cada equipo con su consulta SQL
+            numpy = False
+        np = numpy
+    return np or None
+
+
+class TierArrays:
+    """
+    The catalog encoded as parallel arrays, in id order.
+
+    Keys are replaced by integer codes so a whole batch of rigs is checked
+    with one broadcast comparison per part, using the same rule as the SQL
+    path: same key or a strictly lower tier, and no more RAM than the rig has.
+    """
+
+    # Elementos (equipos x juegos) evaluados de una vez; acota la memoria de las mascaras
+    CHUNK = 4_000_000
+
+    def __init__(self, rows):
+        self.cpu_codes = {}
+        self.gpu_codes = {}
+        self.ids = np.array([row["id"] for row in rows], dtype=np.int64)
+        self.cpu_tier = np.array([row["cpu_tier"] for row in rows], dtype=np.int32)
+        self.gpu_tier = np.array([row["gpu_tier"] for row in rows], dtype=np.int32)
+        self.cpu_code = np.array([self.cpu_codes.setdefault(row["cpu_key"], len(self.cpu_codes)) for row in rows], dtype=np.int32)
+        self.gpu_code = np.array([self.gpu_codes.setdefault(row["gpu_key"], len(self.gpu_codes)) for row in rows], dtype=np.int32)
+        self.ram = np.array([row["ram"] for row in rows], dtype=np.int64)
+
+    @classmethod
+    def from_arrays(cls, ids, cpu_tier, gpu_tier, cpu_code, gpu_code, ram, cpu_codes, gpu_codes):
+        """TierArrays over columns that already exist, such as views of a mapped snapshot, without copying them."""
+        arrays = cls.__new__(cls)
+        arrays.ids, arrays.cpu_tier, arrays.gpu_tier, arrays.ram = ids, cpu_tier, gpu_tier, ram
+        arrays.cpu_code, arrays.gpu_code = cpu_code, gpu_code
+        arrays.cpu_codes, arrays.gpu_codes = cpu_codes, gpu_codes
+        return arrays
+
+    def __len__(self):
+        return len(self.ids)
+
+    def masks(self, rigs):
+        """
+        Yield one boolean array per rig, True where the game at that position runs.
+
+        rigs holds resolved (cpu_key, cpu_tier, gpu_key, gpu_tier, ram) tuples.
+        """
+        step = max(1, self.CHUNK // max(1, len(self.ids)))
+        for start in range(0, len(rigs), step):
+            chunk = rigs[start:start + step]
+            cpu_key, cpu_tier, gpu_key, gpu_tier, ram = zip(*chunk)
+            cpu_code = np.array([self.cpu_codes.get(key, -1) for key in cpu_key], dtype=np.int32)[:, None]
+            gpu_code = np.array([self.gpu_codes.get(key, -1) for key in gpu_key], dtype=np.int32)[:, None]
+            cpu_tier = np.array(cpu_tier, dtype=np.int32)[:, None]
+            gpu_tier = np.array(gpu_tier, dtype=np.int32)[:, None]
+            ram = np.array(ram, dtype=np.int64)[:, None]
+
+            mask = (self.cpu_tier < cpu_tier) | (self.cpu_code == cpu_code)
+            mask &= (self.gpu_tier < gpu_tier) | (self.gpu_code == gpu_code)
+            mask &= self.ram <= ram
+            yield from mask
+
+    def ids_for(self, mask):
+        return self.ids[mask].tolist()
+
+    def bitmap(self, mask):
+        """Pack mask into bytes, most significant bit first, like numpy.packbits."""
+        return np.packbits(mask).tobytes()
+
+
+def pack_positions(positions, size):
+    """Bitmap of `size` bits with the given positions set, in numpy.packbits order."""
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 0x80 >> (position & 7)
+    return bytes(bits)
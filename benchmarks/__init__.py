@@ -0,0 +1,6 @@
+"""
+Benchmarks for the app.
+
+`python -m benchmarks` runs the scripted load scenarios (see __main__.py);
+the bench_*.py scripts measure single subsystems and run on their own.
+"""
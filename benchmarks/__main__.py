@@ -0,0 +1,139 @@
+"""
+Load-test every scenario and report throughput, latency percentiles and peak RSS.
+
+    python -m benchmarks [--mode inprocess|server|both] [--scenario NAME ...]
+                         [--clients N] [--requests N]
+                         [--save FILE] [--compare FILE] [--tolerance 0.2]
+
+Each scenario runs in a fresh interpreter against its own copy of
+finance.db, with quotes served by a local stub. --save writes the results
+as a JSON baseline; --compare checks them against one and exits with
+status 1 if throughput dropped or p95 latency grew by more than the
+tolerance.
+
+A baseline only means something on the machine and at the revision it was
+recorded on, so none is committed. Record one on the machine that will run
+the comparison, at the revision to compare against:
+
+    git checkout main && python -m benchmarks --save benchmarks/baseline.json
+    git checkout -  && python -m benchmarks --compare benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from harness import ROOT
+
+
+def child(scenario_name, mode, clients, requests):
+    """Run one scenario in this process and print its summary as JSON."""
+    import harness
+    from quote_stub import QuoteStub
+    from scenarios import SCENARIOS
+
+    stub = QuoteStub().start()
+    application, directory = harness.load_app(stub.url)
+    scenario = SCENARIOS[scenario_name]
+    try:
+        if mode == "server":
+            base_url, server = harness.serve(application.app)
+            result = harness.run(scenario, lambda: harness.HttpTransport(base_url), clients, requests)
+            server.shutdown()
+        else:
+            result = harness.run(scenario, lambda: harness.TestClientTransport(application.app), clients, requests)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Print each result against the baseline; return the names that regressed."""
+    regressions = []
+    print(f"\n{'vs baseline':<32} {'req/s':>9} {'p95':>9}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<32} {'(new)':>9}")
+            continue
+        throughput = result["throughput"] / before["throughput"] - 1
+        p95 = result["p95"] / before["p95"] - 1 if before["p95"] else 0.0
+        regressed = throughput < -tolerance or p95 > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<32} {throughput:+8.0%} {p95:+8.0%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    from scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--mode", choices=("inprocess", "server", "both"), default="inprocess")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; default all")
+    parser.add_argument("--clients", type=int, help="concurrent clients (default per scenario)")
+    parser.add_argument("--requests", type=int, help="requests per client (default per scenario)")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, mode, clients, requests = args.child
+        return child(name, mode, int(clients), int(requests))
+
+    modes = ("inprocess", "server") if args.mode == "both" else (args.mode,)
+    results = {}
+    print(f"{'scenario':<32} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>7}")
+    for mode in modes:
+        for name in args.scenario or SCENARIOS:
+            scenario = SCENARIOS[name]
+            clients = args.clients or scenario.clients
+            requests = args.requests or scenario.per_client
+            output = subprocess.check_output(
+                [sys.executable, "-m", "benchmarks", "--child", name, mode, str(clients), str(requests)],
+                cwd=ROOT, text=True)
+            result = json.loads(output.strip().splitlines()[-1])
+            key = f"{mode}/{name}"
+            results[key] = result
+            print(f"{key:<32} {result['requests']:6} {result['errors']:6} {result['throughput']:9.1f} "
+                  f"{result['p50'] * 1e3:8.2f} {result['p95'] * 1e3:8.2f} {result['p99'] * 1e3:8.2f} {result['peak_rss_mb']:7.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {
+                    "revision": git_revision(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cpus": os.cpu_count(),
+                    "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
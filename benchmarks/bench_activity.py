@@ -0,0 +1,105 @@
+"""
+Request latency of /history and /buy with the activity log off, written
+behind the requests (buffered) and written inside them (sync), each with the
+writer's synchronous PRAGMA at NORMAL and FULL. Then the time of one page of
+recent activity, by keyset and by OFFSET, deep into a user's history.
+
+    python benchmarks/bench_activity.py [threads] [requests-per-thread]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from harness import ROOT, percentile
+
+MODES = [("off", "NORMAL"), ("buffered", "NORMAL"), ("buffered", "FULL"), ("sync", "NORMAL"), ("sync", "FULL")]
+RAM = ["2", "4", "8", "16"]
+
+
+def latencies(app, threads, per_thread):
+    """Latencies of per_thread requests from each of `threads` logged-in clients."""
+    samples = []
+    lock = threading.Lock()
+
+    def client(worker):
+        http = app.test_client()
+        with http.session_transaction() as session:
+            session["user_id"] = 1 + worker
+        mine = []
+        for i in range(per_thread):
+            start = time.perf_counter()
+            if i % 2:
+                http.post("/buy", data={"query": f"halo {i}"})
+            else:
+                http.post("/history", data={"cpu": "Intel Core i7", "gpu": "NVIDIA RTX 3080", "ram": RAM[i % len(RAM)]})
+            mine.append(time.perf_counter() - start)
+        with lock:
+            samples.extend(mine)
+
+    workers = [threading.Thread(target=client, args=(worker,)) for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return samples
+
+
+def pages(directory, events=200_000, depth=150_000, limit=50):
+    """(events, depth, keyset seconds, OFFSET seconds) for the page `depth` events back in the history of a user with `events` events."""
+    from activity import ActivityLog
+    from database import Database
+
+    db = Database(os.path.join(directory, "finance.db"))
+    log = ActivityLog(db, mode="off")
+    rows = [(7, "search", '{"query":"halo"}',
+             f"2026-01-01 {i // 3_600_000:02d}:{i // 60_000 % 60:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}000")
+            for i in range(events)]
+    for start in range(0, len(rows), 500):
+        log._write(rows[start:start + 500])
+    cursor = db.execute("SELECT id FROM activity WHERE user_id = 7 ORDER BY date DESC, id DESC LIMIT 1 OFFSET ?", depth - 1)[0]["id"]
+
+    start = time.perf_counter()
+    for _ in range(100):
+        log.recent(7, cursor, limit)
+    keyset = (time.perf_counter() - start) / 100
+    start = time.perf_counter()
+    for _ in range(100):
+        db.execute("SELECT id, kind, detail, date FROM activity WHERE user_id = ? ORDER BY date DESC, id DESC "
+                   "LIMIT ? OFFSET ?", 7, limit, depth)
+    offset = (time.perf_counter() - start) / 100
+    return events, depth, keyset, offset
+
+
+def main(threads=4, per_thread=250):
+    from app import create_app, resources
+
+    print(f"{threads} threads x {per_thread} requests (POST /history and POST /buy)")
+    print(f"{'log':<9} {'pragma':<7} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'written':>8}")
+    for mode, synchronous in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+            app = create_app({"DATABASE": os.path.join(directory, "finance.db"), "ACTIVITY_LOG": mode,
+                              "ACTIVITY_SYNCHRONOUS": synchronous, "METRICS_ENABLED": False})
+            resources(app).warm()
+            latencies(app, threads, 10)              # plantillas y caches calientes en todos los modos
+            samples = latencies(app, threads, per_thread)
+            log = resources(app).activity
+            log.close()
+            print(f"{mode:<9} {synchronous:<7} {sum(samples) / len(samples) * 1e3:8.2f} {percentile(samples, 50) * 1e3:8.2f} "
+                  f"{percentile(samples, 99) * 1e3:8.2f} {log.written:8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+        events, depth, keyset, offset = pages(directory)
+    print(f"page {depth} events back, {events} events: keyset {keyset * 1e3:.3f} ms, OFFSET {offset * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
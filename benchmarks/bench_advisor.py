@@ -0,0 +1,123 @@
+"""
+Upgrade advice per rig, rescanning the catalog for every candidate part
+versus UpgradeAdvisor's precomputed counts, over a copy of finance.db and
+over a synthetic catalog. The full advise() and needs() answers for the
+scanned rigs are checked against the brute force first.
+
+    python benchmarks/bench_advisor.py [rigs] [titles]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from advisor import UpgradeAdvisor
+from bench_compat import random_rigs, synthetic_catalog
+from catalog import GameRepository, import_catalog
+from database import Database
+from harness import ROOT
+from hardware import cpu_ranking, gpu_ranking
+
+
+def scan(games, cpu_key, cpu_tier, gpu_key, gpu_tier, ram):
+    return sum(1 for game in games
+               if (game.cpu_tier < cpu_tier or game.cpu_key == cpu_key)
+               and (game.gpu_tier < gpu_tier or game.gpu_key == gpu_key)
+               and game.ram <= ram)
+
+
+def naive(games, advisor, cpu, gpu, ram, unlock=None):
+    """advise() by brute force: one full scan per part of the hierarchies and per RAM value of the catalog."""
+    cpu_key, cpu_tier = cpu_ranking.resolve(cpu)
+    gpu_key, gpu_tier = gpu_ranking.resolve(gpu)
+    ram = int(ram)
+    current = scan(games, cpu_key, cpu_tier, gpu_key, gpu_tier, ram)
+
+    def frontier(options):
+        best, steps = current, []
+        for tier, name, runs in options:
+            if runs > best:
+                steps.append({"name": name, "tier": tier, "unlocks": runs - current})
+                best = runs
+        return steps
+
+    advice = {
+        "current": current,
+        "total": len(games),
+        "cpu": frontier((tier, name, scan(games, key, tier, gpu_key, gpu_tier, ram))
+                        for tier, key, name in advisor.cpu_parts if tier >= cpu_tier and key != cpu_key),
+        "gpu": frontier((tier, name, scan(games, cpu_key, cpu_tier, key, tier, ram))
+                        for tier, key, name in advisor.gpu_parts if tier >= gpu_tier and key != gpu_key),
+        "ram": frontier((step, step, scan(games, cpu_key, cpu_tier, gpu_key, gpu_tier, step))
+                        for step in sorted({game.ram for game in games}) if step > ram),
+    }
+    options = [{"part": part, **advice[part][-1]} for part in ("cpu", "gpu", "ram") if advice[part]]
+    advice["best"] = max(options, key=lambda option: option["unlocks"], default=None)
+    if unlock is not None:
+        advice["cheapest"] = {part: next((step for step in advice[part] if step["unlocks"] >= unlock), None)
+                              for part in ("cpu", "gpu", "ram")}
+    return advice
+
+
+def naive_needs(advisor, cpu, gpu, ram, game):
+    """needs() by brute force: the first part of each hierarchy, cheapest first, that runs the game."""
+    cpu_key, cpu_tier = cpu_ranking.resolve(cpu)
+    gpu_key, gpu_tier = gpu_ranking.resolve(gpu)
+
+    def cheapest(parts, key, tier):
+        return next(({"name": name, "tier": part_tier} for part_tier, part_key, name in parts
+                     if part_key == key or part_tier > tier), {"name": None, "tier": None})
+
+    return {
+        "game": game.to_json(),
+        "cpu": None if game.cpu_tier < cpu_tier or game.cpu_key == cpu_key
+        else cheapest(advisor.cpu_parts, game.cpu_key, game.cpu_tier),
+        "gpu": None if game.gpu_tier < gpu_tier or game.gpu_key == gpu_key
+        else cheapest(advisor.gpu_parts, game.gpu_key, game.gpu_tier),
+        "ram": None if game.ram <= int(ram) else {"name": game.ram, "tier": game.ram},
+    }
+
+
+def compare(label, path, rigs):
+    db = Database(path)
+    games = GameRepository(db).all()
+    start = time.perf_counter()
+    advisor = UpgradeAdvisor(games)
+    build = time.perf_counter() - start
+
+    sample = rigs[:max(1, len(rigs) // 50)]
+    start = time.perf_counter()
+    expected = [naive(games, advisor, *rig, unlock=5) for rig in sample]
+    scanned = (time.perf_counter() - start) / len(sample)
+    targets = games[::max(1, len(games) // 50)]
+    for rig, advice in zip(sample, expected):
+        assert advisor.advise(*rig, unlock=5) == advice, rig
+        for game in targets:
+            assert advisor.needs(*rig, game.id) == naive_needs(advisor, *rig, game), (rig, game)
+
+    start = time.perf_counter()
+    for rig in rigs:
+        advisor.advise(*rig)
+    advised = (time.perf_counter() - start) / len(rigs)
+    db.close()
+    print(f"{label:<22} {len(games):>7} {build * 1e3:9.1f} {scanned * 1e3:10.2f} {advised * 1e6:11.1f}")
+
+
+def main(rigs=2000, titles=100_000):
+    rigs = random_rigs(rigs)
+    print(f"{'catalog':<22} {'titles':>7} {'build ms':>9} {'scan ms':>10} {'advise us':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)      # abrir el archivo del repo dejaria -wal y -shm a su lado
+        compare("finance.db", os.path.join(directory, "finance.db"), rigs)
+        path = os.path.join(directory, "catalog.db")
+        import_catalog(path, synthetic_catalog(titles))
+        compare("synthetic", path, rigs)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,104 @@
+"""
+Asset pipeline cost and what it saves on the wire.
+
+Synthetic covers (COVER_SIZE, one per catalog image) are written to a copy of
+the static folder. The benchmark times a cold and an incremental
+build_assets(), then counts the bytes a browser downloads for one /buy page
+and one /history result page with their stylesheet and images. It does this
+before the build (originals, no compression) and after it (thumbnails,
+WebP, br).
+
+    python benchmarks/bench_assets.py
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from PIL import Image
+
+COVER_SIZE = (900, 1200)
+BEFORE = {"Accept": "*/*", "Accept-Encoding": "identity"}
+AFTER = {"Accept": "image/avif,image/webp,*/*", "Accept-Encoding": "gzip, deflate, br"}
+SOURCES = re.compile(rb'(?:src|href)="(/static/[^"]+)"')
+
+
+def covers(folder, names):
+    """Write one synthetic cover per name: a fractal with some noise, so it compresses like a picture."""
+    os.makedirs(os.path.join(folder, "images"), exist_ok=True)
+    base = Image.effect_mandelbrot(COVER_SIZE, (-2.2, -1.6, 1.0, 1.6), 64).convert("RGB")
+    for i, name in enumerate(names):
+        noise = Image.effect_noise(COVER_SIZE, 40 + i % 30).convert("RGB")
+        cover = Image.blend(base.rotate(i % 360), noise, 0.2)
+        if name.lower().endswith(".png"):
+            cover.convert("RGBA").save(os.path.join(folder, "images", name))
+        else:
+            cover.save(os.path.join(folder, "images", name), quality=90)
+
+
+def transferred(client, method, url, headers, data=None):
+    """Bytes of a page plus every stylesheet and image it links from /static, each counted once."""
+    response = client.open(url, method=method, headers=headers, data=data)
+    total = len(response.data)
+    body = response.data
+    if response.headers.get("Content-Encoding") == "br":
+        import brotli
+        body = brotli.decompress(body)
+    elif response.headers.get("Content-Encoding") == "gzip":
+        import gzip
+        body = gzip.decompress(body)
+    for source in set(SOURCES.findall(body)):
+        total += len(client.get(source.decode().replace("&amp;", "&"), headers=headers).data)
+    return total
+
+
+def pages(client, headers):
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    return {
+        "GET /buy": transferred(client, "GET", "/buy", headers),
+        "POST /history": transferred(client, "POST", "/history", headers,
+                                     {"cpu": "Intel Core i7", "gpu": "NVIDIA RTX 3080", "ram": "32"}),
+    }
+
+
+def main():
+    from app import create_app
+    from assets import build_assets
+    from database import Database
+
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+        static = os.path.join(directory, "static")
+        shutil.copytree(os.path.join(ROOT, "static"), static)
+        names = sorted({row["image"] for row in Database(os.path.join(directory, "finance.db")).execute("SELECT image FROM games")})
+        covers(static, names)
+
+        app = create_app({"DATABASE": os.path.join(directory, "finance.db")})
+        app.static_folder = static
+        before = pages(app.test_client(), BEFORE)
+
+        start = time.perf_counter()
+        build_assets(static)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        build_assets(static)
+        warm = time.perf_counter() - start
+        app = create_app({"DATABASE": os.path.join(directory, "finance.db")})     # sin los fragmentos renderizados antes del build
+        app.static_folder = static
+        after = pages(app.test_client(), AFTER)
+
+    print(f"{len(names)} covers of {COVER_SIZE[0]}x{COVER_SIZE[1]}: build {cold:.2f} s cold, {warm * 1e3:.1f} ms unchanged")
+    print(f"{'page':<14} {'before KB':>10} {'after KB':>9}")
+    for page in before:
+        print(f"{page:<14} {before[page] / 1024:10.1f} {after[page] / 1024:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Requests per second at 200 concurrent clients, with the quote API answering
+after a fixed delay, for the sync setup and for the ASGI mode of asgi.py.
+
+"sync" is the Flask app on a server with THREADS worker threads and one
+request per connection, like gunicorn's sync workers. "asgi" is uvicorn
+serving asgi.application, with the same THREADS threads left for the Flask
+routes. Each server runs in its own interpreter against a copy of
+finance.db, the quote stub in another, and the clients (asyncio, one
+keep-alive connection each) in this one, all logged in as the bench user.
+Every /api/quote asks for a new symbol, so none is cached.
+
+    python benchmarks/bench_async.py [clients] [requests-per-client] [delay-seconds]
+"""
+
+import asyncio
+import http.client
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from harness import BENCH_USER, percentile
+
+THREADS = 16
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(mode, port, quotes_url):
+    """Run in the child: serve the app on port until killed."""
+    import harness
+
+    application, _ = harness.load_app(quotes_url)
+    if mode == "sync":
+        from werkzeug.serving import ThreadedWSGIServer
+
+        logging.getLogger("werkzeug").disabled = True
+        class PooledServer(ThreadedWSGIServer):
+            request_queue_size = 2048
+            multithread = False             # HTTP/1.0: el hilo queda libre al terminar cada peticion
+            pool = ThreadPoolExecutor(THREADS)
+
+            def process_request(self, request, client_address):
+                self.pool.submit(self.process_request_thread, request, client_address)
+
+        PooledServer("127.0.0.1", port, application.app).serve_forever()
+    else:
+        import uvicorn
+        from asgi import AsyncApp
+
+        application.app.config["ASGI_SYNC_THREADS"] = THREADS
+        uvicorn.run(AsyncApp(application.app), host="127.0.0.1", port=port, log_level="warning", backlog=2048)
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+def login(port):
+    """Session cookie of the bench user, from a POST /login."""
+    username, password = BENCH_USER
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("POST", "/login", f"username={username}&password={password}",
+                       {"Content-Type": "application/x-www-form-urlencoded"})
+    response = connection.getresponse()
+    cookie = response.getheader("Set-Cookie", "").split(";")[0]
+    connection.close()
+    if response.status != 302 or not cookie:
+        raise RuntimeError(f"login failed with status {response.status}")
+    return cookie
+
+
+async def get(connection, host, port, path, cookie):
+    """GET path over connection ([reader, writer], reopened when the server closes it); returns the status."""
+    if connection[0] is None:
+        connection[:] = await asyncio.open_connection(host, port)
+    reader, writer = connection
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nCookie: {cookie}\r\n\r\n".encode())
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        await reader.read()
+    if "content-length" not in headers or headers.get("connection") == "close" or reader.at_eof():
+        writer.close()
+        connection[:] = [None, None]
+    return status
+
+
+async def load(port, path, clients, per_client, cookie):
+    """
+    (requests/s, p50, p99, errors) of `clients` tasks, each with its own
+    keep-alive connection, sending per_client GETs of path ({n} filled in).
+    Plain asyncio streams: httpx's pool stalled the clients long before the
+    servers at these concurrencies.
+    """
+    latencies, errors = [], 0
+
+    async def client(worker):
+        nonlocal errors
+        connection = [None, None]
+        for i in range(per_client):
+            start = time.perf_counter()
+            try:
+                errors += await get(connection, "127.0.0.1", port, path.format(n=f"{worker}x{i}"), cookie) != 200
+            except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                errors += 1
+                connection[:] = [None, None]
+            latencies.append(time.perf_counter() - start)
+        if connection[1] is not None:
+            connection[1].close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(worker) for worker in range(clients)))
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, percentile(latencies, 50), percentile(latencies, 99), errors
+
+
+def main(clients=200, per_client=10, delay=0.25):
+    stub_port = free_port()
+    stub = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), "quote_stub.py"),
+                             str(stub_port), str(delay)])
+    wait_for(stub_port)
+    print(f"{clients} clients x {per_client} requests, upstream delay {delay * 1e3:.0f} ms, {THREADS} threads")
+    print(f"{'route':<16} {'mode':<5} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    try:
+        for mode in ("sync", "asgi"):
+            port = free_port()
+            server = subprocess.Popen([sys.executable, __file__, "--serve", mode, str(port), f"http://127.0.0.1:{stub_port}"])
+            try:
+                wait_for(port)
+                cookie = login(port)
+                for path in ("/api/quote?symbol=S{n}", "/api/games"):
+                    rate, p50, p99, errors = asyncio.run(load(port, path, clients, per_client, cookie))
+                    print(f"{path.split('?')[0]:<16} {mode:<5} {rate:8.0f} {p50 * 1e3:8.1f} {p99 * 1e3:8.1f} {errors:7}")
+            finally:
+                server.send_signal(signal.SIGINT)      # con SIGTERM los procesos de hashing quedaban huerfanos
+                server.wait()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        serve(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+    else:
+        main(*(float(arg) if "." in arg else int(arg) for arg in sys.argv[1:]))
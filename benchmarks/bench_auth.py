@@ -0,0 +1,96 @@
+"""
+/buy latency while a storm of logins hits the same server.
+
+Runs the app on a local threaded werkzeug server against a copy of
+finance.db, once hashing inline on the request threads and once on the
+auth process pool, and reports GET /buy percentiles for each.
+
+    python benchmarks/bench_auth.py [storm clients] [seconds]
+"""
+
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+from werkzeug.serving import make_server
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+logging.getLogger("werkzeug").disabled = True
+logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+
+def percentile(samples, p):
+    return statistics.quantiles(samples, n=100, method="inclusive")[p - 1]
+
+
+def storm(application, label, clients, seconds, workers):
+    from auth import PasswordHasher
+
+    application.resources(application.app).hasher = PasswordHasher(workers, application.app.config["AUTH_QUEUE_SIZE"])
+    server = make_server("127.0.0.1", 0, application.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    stop = threading.Event()
+    statuses = []
+
+    def login():
+        with requests.Session() as http:
+            while not stop.is_set():
+                response = http.post(f"{url}/login", data={"username": "bench", "password": "bench"}, allow_redirects=False)
+                statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=login) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+
+    latencies = []
+    deadline = time.monotonic() + seconds
+    with requests.Session() as http:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            http.get(f"{url}/buy")
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.01)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+
+    logins = statuses.count(302)
+    rejected = statuses.count(503)
+    print(f"{label:>7} {percentile(latencies, 50) * 1e3:8.1f} {percentile(latencies, 99) * 1e3:8.1f} "
+          f"{max(latencies) * 1e3:8.1f} {logins:7} {rejected:8}")
+
+
+def main(clients=32, seconds=5):
+    directory = tempfile.mkdtemp()
+    try:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+        os.chdir(directory)
+        import app as application
+
+        resources = application.resources(application.app)
+        resources.ip_buckets.rate = resources.user_buckets.rate = 1e9
+        resources.db.execute("DELETE FROM users WHERE username = 'bench'")
+        resources.db.execute("INSERT INTO users (username, hash) VALUES ('bench', ?)", resources.hasher.hash("bench"))
+
+        print(f"{clients} clients logging in for {seconds} s")
+        print(f"{'mode':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'logins':>7} {'503s':>8}")
+        storm(application, "idle", 0, seconds, 0)
+        storm(application, "inline", clients, seconds, 0)
+        storm(application, "pool", clients, seconds, application.app.config["AUTH_WORKERS"])
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
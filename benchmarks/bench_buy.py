@@ -0,0 +1,81 @@
+"""
+Peak RSS and time to first byte of GET /buy over a synthetic catalog.
+
+Each mode runs in a fresh interpreter so its memory high-water mark is its
+own. "full" renders every game in one response, as /buy used to; "page" is
+the first cursor page, "stream" is /buy?all=1 and "json" is /api/games.
+
+    python benchmarks/bench_buy.py [titles]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+MODES = {
+    "full": "/bench/full",
+    "page": "/buy",
+    "stream": "/buy?all=1",
+    "json": "/api/games",
+}
+
+
+def measure(path, url):
+    """Run in the child: serve url from the catalog at path and report KiB of peak RSS growth and TTFB."""
+    os.chdir(ROOT)
+
+    from flask import render_template
+
+    from app import create_app, resources
+
+    app = create_app({"DATABASE": path})
+    catalog = resources(app).catalog
+    app.add_url_rule(
+        "/bench/full", "bench_full",
+        lambda: render_template("buy.html", games=catalog.db.execute(f"SELECT {catalog.COLUMNS} FROM games ORDER BY id")))
+    client = app.test_client()
+    client.get("/buy?after=999999999")
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    chunks = iter(response.response)
+    size = len(next(chunks))
+    ttfb = time.perf_counter() - start
+    for chunk in chunks:
+        size += len(chunk)
+    total = time.perf_counter() - start
+    response.close()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    print(peak, ttfb, total, size)
+
+
+def main(titles=100_000):
+    from bench_search import synthetic_catalog
+    from catalog import import_catalog
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        import_catalog(path, synthetic_catalog(titles))
+
+        print(f"{titles} titles")
+        print(f"{'mode':>8} {'peak RSS':>10} {'TTFB ms':>9} {'total ms':>9} {'bytes':>10}")
+        for mode, url in MODES.items():
+            output = subprocess.check_output(
+                [sys.executable, __file__, "--child", path, url], text=True).split()[-4:]
+            peak, ttfb, total, size = int(output[0]), float(output[1]), float(output[2]), int(output[3])
+            print(f"{mode:>8} {peak / 1024:8.1f} MB {ttfb * 1e3:9.1f} {total * 1e3:9.1f} {size:10}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        measure(sys.argv[2], sys.argv[3])
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
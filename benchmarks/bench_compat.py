@@ -0,0 +1,70 @@
+"""
+Rigs per second for compatibility checks, one SQL query per rig versus the
+NumPy batch, over finance.db and over a synthetic catalog. Every batch
+result is checked against the scalar path first.
+
+    python benchmarks/bench_compat.py [rigs] [titles]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from catalog import GameRepository, import_catalog
+from database import Database
+from hardware import CPU_ALIASES, CPU_HIERARCHY, GPU_ALIASES, GPU_HIERARCHY
+
+CPUS = list(CPU_HIERARCHY) + list(CPU_ALIASES) + ["Unknown CPU"]
+GPUS = list(GPU_HIERARCHY) + list(GPU_ALIASES) + ["Unknown GPU"]
+
+
+def random_rigs(count, seed=13):
+    rng = random.Random(seed)
+    return [(rng.choice(CPUS), rng.choice(GPUS), rng.choice([1, 2, 3, 4, 6, 8, 12, 16, 32, 64])) for _ in range(count)]
+
+
+def synthetic_catalog(titles, seed=13):
+    rng = random.Random(seed)
+    games = [{"name": f"Game {i}", "cpu": rng.choice(CPUS), "gpu": rng.choice(GPUS),
+              "ram": str(rng.choice([1, 2, 4, 6, 8, 12, 16])), "image": ""} for i in range(titles)]
+    return {"Bajo": games}
+
+
+def compare(label, path, rigs):
+    scalar = GameRepository(Database(path), compat_cache_size=0)
+    batch = GameRepository(Database(path))
+
+    start = time.perf_counter()
+    expected = [[game.id for game in scalar.compatible(*rig)] for rig in rigs]
+    scalar_rate = len(rigs) / (time.perf_counter() - start)
+
+    batch.compatible_many(rigs[:1])
+    start = time.perf_counter()
+    got = batch.compatible_many(rigs)
+    batch_rate = len(rigs) / (time.perf_counter() - start)
+
+    assert got == expected, "batch results differ from compatible()"
+    print(f"{label:>22} {scalar_rate:12.0f} {batch_rate:12.0f} {batch_rate / scalar_rate:8.1f}x")
+
+
+def main(rigs=2000, titles=20_000):
+    rigs = random_rigs(rigs)
+    with tempfile.TemporaryDirectory() as directory:
+        real = os.path.join(directory, "finance.db")
+        shutil.copy(os.path.join(os.path.dirname(__file__), "..", "finance.db"), real)
+        synthetic = os.path.join(directory, "synthetic.db")
+        import_catalog(synthetic, synthetic_catalog(titles))
+
+        print(f"{len(rigs)} rigs, rigs/s")
+        print(f"{'catalog':>22} {'per-rig SQL':>12} {'NumPy batch':>12} {'speedup':>9}")
+        compare("finance.db", real, rigs)
+        compare(f"{titles} synthetic", synthetic, rigs)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,91 @@
+"""
+Mixed register/login/change_password database traffic from several threads,
+through cs50's SQL and through database.Database.
+
+Only the users-table statements are timed; password hashing is left out.
+Each layer gets its own copy of finance.db, and cs50 runs it with the
+default rollback journal.
+
+    python benchmarks/bench_db.py [operations] [threads]
+"""
+
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from cs50 import SQL
+
+from database import Database, Users
+
+HASH = "scrypt:32768:8:1$salt$" + "0" * 128
+
+
+class Cs50Users(Users):
+    """The same statements, sent through cs50's SQL."""
+
+    def __init__(self, path):
+        super().__init__(SQL(f"sqlite:///{path}"))
+
+
+def traffic(users, operations, threads, seed):
+    names = [row["username"] for row in users.db.execute("SELECT username FROM users")]
+    ids = [row["id"] for row in users.db.execute("SELECT id FROM users")]
+    errors = []
+
+    def worker(number):
+        rng = random.Random(seed + number)
+        try:
+            for i in range(operations // threads):
+                roll = rng.random()
+                if roll < 0.7:
+                    users.by_username(rng.choice(names))
+                elif roll < 0.85:
+                    users.create(f"bench-{seed}-{number}-{i}", HASH)
+                else:
+                    user_id = rng.choice(ids)
+                    users.hash_of(user_id)
+                    users.set_hash(user_id, HASH)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return operations / elapsed, errors
+
+
+def main(operations=4000, threads=8):
+    logging.getLogger("cs50").disabled = True
+    directory = tempfile.mkdtemp()
+    try:
+        layers = {}
+        for name in ("cs50", "database"):
+            path = os.path.join(directory, f"{name}.db")
+            shutil.copy(os.path.join(ROOT, "finance.db"), path)
+            with sqlite3.connect(path) as connection:
+                connection.execute("PRAGMA journal_mode = DELETE")
+            layers[name] = path
+
+        print(f"{operations} operations, {threads} threads")
+        for name, users in (("cs50", Cs50Users(layers["cs50"])), ("database", Users(Database(layers["database"])))):
+            rate, errors = traffic(users, operations, threads, seed=1)
+            print(f"{name:>9}: {rate:8.0f} ops/s" + (f"  ({len(errors)} errors: {errors[0]!r})" if errors else ""))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,54 @@
+"""
+Per-request cost of the hardware comparisons done by /history.
+
+"before" rebuilds the hierarchy dict literal on every comparison, the way
+is_higher_cpu/is_higher_gpu used to; "after" goes through hardware.Ranking.
+
+    python benchmarks/bench_hardware.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hardware import CPU_HIERARCHY, GPU_HIERARCHY, cpu_ranking, gpu_ranking
+
+
+def literal_comparator(hierarchy):
+    """Compile a comparator that builds `hierarchy` as a literal per call."""
+    source = (
+        "def is_higher(user, game):\n"
+        f"    hierarchy = {hierarchy!r}\n"
+        "    return hierarchy.get(user, 0) > hierarchy.get(game, 0)\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace["is_higher"]
+
+
+def main(games=183, repeat=2000):
+    cpus = list(CPU_HIERARCHY)
+    gpus = list(GPU_HIERARCHY)
+    catalog = [(cpus[i % len(cpus)], gpus[i % len(gpus)]) for i in range(games)]
+    user_cpu, user_gpu = "Intel Core i5", "NVIDIA GTX 1060"
+
+    old_cpu = literal_comparator(CPU_HIERARCHY)
+    old_gpu = literal_comparator(GPU_HIERARCHY)
+
+    def before():
+        for cpu, gpu in catalog:
+            old_cpu(user_cpu, cpu) and old_gpu(user_gpu, gpu)
+
+    def after():
+        for cpu, gpu in catalog:
+            cpu_ranking.rank(user_cpu) > cpu_ranking.rank(cpu) and gpu_ranking.rank(user_gpu) > gpu_ranking.rank(gpu)
+
+    for label, fn in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat
+        print(f"{label:>6}: {seconds * 1e6:8.1f} us/request ({games} games)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Cost of the instrumentation: per-request time with metrics enabled and
+disabled, and the per-call overhead of a @timed wrapper in both states.
+
+    python benchmarks/bench_metrics.py [requests]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+import metrics
+from app import create_app
+
+PAGES = [
+    ("GET /buy", "get", "/buy", None),
+    ("POST /buy", "post", "/buy", {"query": "creed"}),
+    ("POST /history", "post", "/history", {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "8"}),
+]
+
+
+def per_request(app, requests):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    results = {}
+    for label, method, url, data in PAGES:
+        getattr(client, method)(url, data=data)
+        start = time.perf_counter()
+        for _ in range(requests):
+            getattr(client, method)(url, data=data)
+        results[label] = (time.perf_counter() - start) / requests
+    return results
+
+
+def per_call(calls=1_000_000):
+    def noop():
+        pass
+
+    wrapped = metrics.timed("bench")(noop)
+    start = time.perf_counter()
+    for _ in range(calls):
+        noop()
+    bare = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        wrapped()
+    return (time.perf_counter() - start - bare) / calls
+
+
+def main(requests=2000):
+    timings = {}
+    overhead = {}
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+        for state in (False, True):
+            app = create_app({"DATABASE": os.path.join(directory, "finance.db"), "METRICS_ENABLED": state})
+            timings[state] = per_request(app, requests)
+            metrics.recording.set(state)
+            overhead[state] = per_call()
+
+    print(f"{'page':<14} {'disabled ms':>12} {'enabled ms':>11}")
+    for label, _, _, _ in PAGES:
+        print(f"{label:<14} {timings[False][label] * 1e3:12.3f} {timings[True][label] * 1e3:11.3f}")
+    print(f"@timed overhead per call: {overhead[False] * 1e9:.0f} ns disabled, {overhead[True] * 1e9:.0f} ns enabled")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
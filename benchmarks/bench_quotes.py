@@ -0,0 +1,61 @@
+"""
+Quote lookup throughput at 50 concurrent callers against a local stub.
+
+"before" is the old helpers.lookup: a fresh requests.get per call, no cache.
+"after" is quotes.QuoteClient (pooled session, TTL cache, single-flight).
+
+    python benchmarks/bench_quotes.py [callers] [delay-seconds]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from quote_stub import QuoteStub
+from quotes import QuoteClient
+
+SYMBOLS = ["AAPL", "MSFT", "NFLX", "GOOG", "AMZN", "TSLA", "NVDA", "META", "IBM", "INTC"]
+
+
+def uncached_lookup(base_url):
+    def lookup(symbol):
+        response = requests.get(f"{base_url}/quote?symbol={symbol.upper()}")
+        response.raise_for_status()
+        return response.json()
+    return lookup
+
+
+def run(lookup, callers, calls):
+    symbols = [SYMBOLS[i % len(SYMBOLS)] for i in range(calls)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(lookup, symbols))
+    return calls / (time.perf_counter() - start)
+
+
+def main(callers=50, delay=0.02, calls=2000):
+    stub = QuoteStub(delay=delay).start()
+
+    before = run(uncached_lookup(stub.url), callers, calls)
+    served_before, stub.requests = stub.requests, 0
+
+    pooled = run(QuoteClient(stub.url, ttl=0, pool_size=callers).lookup, callers, calls)
+    served_pooled, stub.requests = stub.requests, 0
+
+    after = run(QuoteClient(stub.url, pool_size=callers).lookup, callers, calls)
+
+    print(f"{callers} callers, {calls} lookups, upstream delay {delay * 1e3:.0f} ms")
+    print(f"       before: {before:10.0f} lookups/s  ({served_before} upstream requests)")
+    print(f"pooled, ttl=0: {pooled:10.0f} lookups/s  ({served_pooled} upstream requests)")
+    print(f"        after: {after:10.0f} lookups/s  ({stub.requests} upstream requests)")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if "." in arg else int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,85 @@
+"""
+Memory held by the loaded catalog and cost of one compatibility check, for
+the old per-game dicts and for catalog.Game records, at several catalog
+sizes.
+
+The dicts have the old shape: five string fields, with RAM as text and
+hardware names compared through the rankings on every request. The records
+come from GameRepository, with interned names, pre-resolved tiers and
+integer RAM.
+
+    python benchmarks/bench_records.py [titles ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_compat import random_rigs, synthetic_catalog
+from catalog import Game, import_catalog
+from database import Database
+from hardware import cpu_ranking, gpu_ranking
+
+RIGS = random_rigs(20)
+
+
+def traced(load):
+    """Return load() and the bytes it still holds once built."""
+    tracemalloc.start()
+    value = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def per_request(check, games):
+    start = time.perf_counter()
+    for rig in RIGS:
+        check(games, *rig)
+    return (time.perf_counter() - start) / len(RIGS)
+
+
+def dict_check(games, user_cpu, user_gpu, user_ram):
+    return [
+        game for game in games
+        if (user_cpu == game["cpu"] or cpu_ranking.rank(user_cpu) > cpu_ranking.rank(game["cpu"]))
+        and (user_gpu == game["gpu"] or gpu_ranking.rank(user_gpu) > gpu_ranking.rank(game["gpu"]))
+        and int(user_ram) >= int(game["ram"])
+    ]
+
+
+def record_check(games, user_cpu, user_gpu, user_ram):
+    cpu_key, cpu_tier = cpu_ranking.resolve(user_cpu)
+    gpu_key, gpu_tier = gpu_ranking.resolve(user_gpu)
+    ram = int(user_ram)
+    # la regla de GameRepository.compatible, sobre los tiers ya resueltos de cada registro
+    return [game for game in games
+            if (game.cpu_tier < cpu_tier or game.cpu_key == cpu_key)
+            and (game.gpu_tier < gpu_tier or game.gpu_key == gpu_key)
+            and game.ram <= ram]
+
+
+def main(*sizes):
+    print(f"{'titles':>8} {'dicts MB':>9} {'records MB':>11} {'dicts ms':>9} {'records ms':>11}")
+    for titles in sizes or (1_000, 10_000, 100_000):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.db")
+            import_catalog(path, synthetic_catalog(titles))
+            db = Database(path)
+
+            dicts, dicts_size = traced(lambda: db.execute(
+                "SELECT name, cpu, gpu, CAST(ram AS TEXT) AS ram, image FROM games ORDER BY id"))
+            records, records_size = traced(lambda: [Game.from_row(row) for row in db.execute(
+                "SELECT id, name, category, cpu, gpu, ram, image, cpu_key, cpu_tier, gpu_key, gpu_tier FROM games ORDER BY id")])
+
+            print(f"{titles:8} {dicts_size / 2**20:9.1f} {records_size / 2**20:11.1f} "
+                  f"{per_request(dict_check, dicts) * 1e3:9.2f} {per_request(record_check, records) * 1e3:11.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
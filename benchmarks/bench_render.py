@@ -0,0 +1,56 @@
+"""
+Render time and response size of the logged-in pages, with the cache of
+rendered fragments emptied before every request (cold) and kept (warm).
+
+    python benchmarks/bench_render.py [requests]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from app import create_app, resources
+
+PAGES = [
+    ("GET /history", "get", "/history", None),
+    ("POST /history", "post", "/history", {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "8"}),
+    ("GET /", "get", "/", None),
+]
+
+
+def run(app, requests, cold):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+
+    for label, method, url, data in PAGES:
+        response = getattr(client, method)(url, data=data)
+        assert response.status_code == 200, label
+        start = time.perf_counter()
+        for _ in range(requests):
+            if cold:
+                resources(app).fragments.clear()
+            getattr(client, method)(url, data=data)
+        elapsed = (time.perf_counter() - start) / requests
+        print(f"  {label:<14} {elapsed * 1000:7.3f} ms  {len(response.data):7d} bytes")
+
+
+def main(requests=500):
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)      # POST /history escribe en activity; el finance.db del repo no se toca
+        app = create_app({"DATABASE": os.path.join(directory, "finance.db"),
+                          "SESSION_FILE_DIR": os.path.join(directory, "flask_session")})
+        for cold in (True, False):
+            print("cold fragments:" if cold else "warm fragments:")
+            run(app, requests, cold)
+        resources(app).activity.close()             # lo que quede en el buffer se escribe antes de borrar la copia
+        resources(app).db.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""
+Latency of the /buy search over a synthetic catalog.
+
+Compares the old per-game re.search loop with GameRepository.search over a
+temporary SQLite catalog (result cache disabled).
+
+    python benchmarks/bench_search.py [titles]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from catalog import GameRepository, import_catalog
+from database import Database
+
+WORDS = [
+    "Assassin's", "Creed", "Call", "of", "Duty", "Far", "Cry", "Halo", "Pokémon",
+    "Légende", "Dark", "Souls", "Warfare", "Black", "Ops", "Chronicles", "Origins",
+    "Remastered", "Edition", "Shadow", "Dragon", "Knight", "Galaxy", "Racing",
+]
+QUERIES = ["creed", "call of duty", "pokemon", "ops", "zz", "legende origins", "dragon knight remastered"]
+
+
+def synthetic_catalog(titles, seed=50):
+    rng = random.Random(seed)
+    games = []
+    for i in range(titles):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))) + f" {i}"
+        games.append({"name": name, "cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "8", "image": ""})
+    return {"Bajo": games}
+
+
+def regex_search(games, query):
+    query = query.strip().lower()
+    return [game for games_list in games.values() for game in games_list if re.search(query, game["name"], re.IGNORECASE)]
+
+
+def timed(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(titles=100_000):
+    games = synthetic_catalog(titles)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        start = time.perf_counter()
+        import_catalog(path, games)
+        print(f"import: {time.perf_counter() - start:.2f} s for {titles} titles")
+
+        repository = GameRepository(Database(path), cache_size=0)
+
+        print(f"{'query':>26} {'regex ms':>10} {'index ms':>10} {'hits':>7}")
+        for query in QUERIES:
+            old = timed(regex_search, games, query)
+            new = timed(repository.search, query)
+            print(f"{query:>26} {old * 1e3:10.2f} {new * 1e3:10.2f} {len(repository.search(query)):7}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
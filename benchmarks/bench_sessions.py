@@ -0,0 +1,56 @@
+"""
+Requests/sec for a logged-in GET / with each session backend.
+
+    python benchmarks/bench_sessions.py [requests] [threads]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from app import create_app, resources
+
+
+def run(app, requests, threads):
+    def worker(count):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = 1
+        for _ in range(count):
+            assert client.get("/").status_code == 200
+
+    workers = [threading.Thread(target=worker, args=(requests // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return requests / (time.perf_counter() - start)
+
+
+def main(requests=2000, threads=8):
+    directory = tempfile.mkdtemp()
+    try:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)      # GET / consulta la base; el finance.db del repo no se toca
+        for backend in ("filesystem", "sqlite", "cookie"):
+            app = create_app({
+                "DATABASE": os.path.join(directory, "finance.db"),
+                "SESSION_BACKEND": backend,
+                "SESSION_FILE_DIR": os.path.join(directory, "flask_session"),
+                "SESSION_DATABASE": os.path.join(directory, "sessions.db"),
+                "SECRET_KEY": os.environ.get("SECRET_KEY") or "bench",
+            })
+            print(f"{backend:>10}: {run(app, requests, threads):8.0f} req/s ({threads} threads)")
+            resources(app).db.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
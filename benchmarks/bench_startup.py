@@ -0,0 +1,86 @@
+"""
+Cold start: the slowest imports under `python -X importtime -c "import app"`,
+and the time from launching a fresh interpreter to the first served GET /buy,
+checked against BUDGET.
+
+    python benchmarks/bench_startup.py [runs]
+
+Exits with status 1 when the median cold start is over budget.
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Segundos desde lanzar el interprete hasta tener la primera respuesta de /buy
+BUDGET = 0.2
+
+CHILD = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get("/buy")
+assert response.status_code == 200, response.status_code
+print(imported - started, time.perf_counter() - imported, flush=True)
+"""
+
+
+def importtime(directory, top=12):
+    """[(cumulative seconds, module)] of the slowest imports, app itself first."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import app"],
+        cwd=directory, capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def cold_start(directory):
+    """(total, import, first request) seconds for one fresh interpreter."""
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", CHILD, ROOT], cwd=directory, stdout=subprocess.PIPE, text=True)
+    line = child.stdout.readline()
+    total = time.perf_counter() - start
+    child.wait()
+    if child.returncode:
+        raise SystemExit(f"child exited with status {child.returncode}")
+    imported, first = (float(value) for value in line.split())
+    return total, imported, first
+
+
+def main(runs=10):
+    directory = tempfile.mkdtemp(prefix="bench-")
+    try:
+        shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+
+        print("slowest imports (cumulative):")
+        for seconds, name in importtime(directory):
+            print(f"  {seconds * 1e3:8.1f} ms  {name}")
+
+        cold_start(directory)       # la primera vez el sistema de archivos y los .pyc estan frios
+        samples = [cold_start(directory) for _ in range(runs)]
+    finally:
+        shutil.rmtree(directory)
+
+    total, imported, first = (statistics.median(column) for column in zip(*samples))
+    print(f"cold start to first /buy, median of {runs}: {total * 1e3:.1f} ms "
+          f"(import app {imported * 1e3:.1f} ms, first request {first * 1e3:.1f} ms, "
+          f"interpreter {(total - imported - first) * 1e3:.1f} ms)")
+    print(f"budget {BUDGET * 1e3:.0f} ms: {'ok' if total <= BUDGET else 'OVER'}")
+    return 0 if total <= BUDGET else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,107 @@
+"""
+Memory of pre-forked workers serving the same traffic over a synthetic
+catalog, read from SQLite and from a mapped snapshot (CATALOG_SNAPSHOT).
+
+Each mode runs in a fresh interpreter: it creates the app, warms it as a
+pre-fork hook would, forks the workers and sums their RSS and PSS (resident
+memory with shared pages split between the processes sharing them) while all
+of them are still alive. Linux only, since it reads /proc/<pid>/smaps_rollup.
+
+    python benchmarks/bench_workers.py [titles] [workers]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+SEARCHES = ["creed", "call of duty", "minecraft", "halo", "far cry", "zz", "battlefield", "need for speed"]
+RAM = [2, 4, 8, 16]
+
+
+def memory(pid):
+    """(RSS, PSS) of pid in KiB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+
+def traffic(client, worker):
+    from hardware import CPU_HIERARCHY, GPU_HIERARCHY
+
+    rng = random.Random(worker)
+    cpus, gpus = list(CPU_HIERARCHY), list(GPU_HIERARCHY)
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    for _ in range(100):
+        client.get(f"/buy?after={rng.randrange(0, 100_000, 50)}")
+    for _ in range(50):
+        client.post("/buy", data={"query": rng.choice(SEARCHES)})
+    for _ in range(20):
+        client.post("/history", data={"cpu": rng.choice(cpus), "gpu": rng.choice(gpus), "ram": str(rng.choice(RAM))})
+    for _ in range(20):
+        rigs = [{"cpu": rng.choice(cpus), "gpu": rng.choice(gpus), "ram": rng.choice(RAM)} for _ in range(8)]
+        client.post("/api/compatibility", json={"rigs": rigs})
+
+
+def measure(path, snapshot, workers):
+    """Run in the child: fork `workers` workers of the app and print their summed memory as JSON."""
+    from app import create_app, warm
+
+    app = create_app({"DATABASE": path, "CATALOG_SNAPSHOT": snapshot or None, "METRICS_ENABLED": False})
+    warm(app)
+
+    ready_read, ready_write = os.pipe()
+    release_read, release_write = os.pipe()
+    pids = []
+    for worker in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(release_write)
+            traffic(app.test_client(), worker)
+            os.write(ready_write, b".")
+            os.read(release_read, 1)            # sigue vivo hasta que el padre haya medido a todos
+            os._exit(0)
+        pids.append(pid)
+
+    for _ in pids:
+        os.read(ready_read, 1)
+    usage = [memory(pid) for pid in pids]
+    os.close(release_write)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    print(json.dumps({"rss": sum(rss for rss, _ in usage), "pss": sum(pss for _, pss in usage)}))
+
+
+def main(titles=100_000, workers=8):
+    from bench_search import synthetic_catalog
+    from catalog import import_catalog
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        import_catalog(path, synthetic_catalog(titles))
+
+        print(f"{titles} titles, {workers} workers")
+        print(f"{'catalog':>9} {'total RSS':>11} {'total PSS':>11}")
+        for mode, snapshot in (("sqlite", ""), ("snapshot", os.path.join(directory, "catalog.snap"))):
+            output = subprocess.check_output(
+                [sys.executable, __file__, "--child", path, snapshot, str(workers)], text=True, cwd=directory)
+            result = json.loads(output.splitlines()[-1])
+            print(f"{mode:>9} {result['rss'] / 1024:8.1f} MB {result['pss'] / 1024:8.1f} MB")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        measure(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
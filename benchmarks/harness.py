@@ -0,0 +1,142 @@
+"""Run a scenario against the app, in-process or over HTTP, and summarize its latencies."""
+
+import logging
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_USER = ("bench", "bench")
+
+
+def percentile(samples, p):
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[p - 1]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class TestClientTransport:
+    """Requests through Flask's test client, in this process."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, url, data=None):
+        response = self.client.open(url, method=method, data=data)
+        response.close()
+        return response.status_code
+
+
+class HttpTransport:
+    """Requests over a keep-alive HTTP session to a running server."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    def request(self, method, url, data=None):
+        response = self.session.request(method, self.base_url + url, data=data, allow_redirects=False)
+        return response.status_code
+
+
+def load_app(quotes_url):
+    """
+    Import the app against a private copy of finance.db, with quotes served
+    from quotes_url, login throttling lifted and a known bench user.
+    """
+    directory = tempfile.mkdtemp(prefix="bench-")
+    shutil.copy(os.path.join(ROOT, "finance.db"), directory)
+    os.chdir(directory)
+    os.environ["QUOTES_URL"] = quotes_url
+    os.environ.setdefault("SESSION_BACKEND", "cookie")      # los escenarios se midieron con la sesion en la cookie
+    os.environ.setdefault("SECRET_KEY", "bench")
+    sys.path.insert(0, ROOT)
+
+    import app as application
+
+    resources = application.resources(application.app)
+    resources.ip_buckets.rate = resources.user_buckets.rate = 1e9
+    username, password = BENCH_USER
+    try:
+        resources.users.create(username, resources.hasher.hash(password))
+    except ValueError:
+        pass
+    return application, directory
+
+
+def serve(app):
+    """Start app on a threaded local server; returns (base_url, server)."""
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").disabled = True
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def run(scenario, transport, clients, requests_per_client):
+    """
+    Run scenario from `clients` threads, each with its own transport() and
+    `requests_per_client` requests, and summarize the run.
+    """
+    latencies = []
+    statuses = []
+    failures = []
+    lock = threading.Lock()
+    ready = threading.Barrier(clients + 1)
+
+    def client(worker):
+        try:
+            http = transport()
+            scenario.setup(http, worker)
+            traffic = scenario.traffic(worker)
+        except Exception as e:
+            with lock:
+                failures.append(repr(e))
+            ready.wait()
+            return
+        mine = []
+        ready.wait()
+        for _ in range(requests_per_client):
+            method, url, data = next(traffic)
+            start = time.perf_counter()
+            try:
+                status = http.request(method, url, data)
+            except Exception as e:
+                with lock:
+                    failures.append(repr(e))
+                continue
+            mine.append((time.perf_counter() - start, status))
+        with lock:
+            latencies.extend(latency for latency, _ in mine)
+            statuses.extend(status for _, status in mine)
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(clients)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": len(failures) + sum(status >= 500 for status in statuses),
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "peak_rss_mb": peak_rss_mb(),
+    }
@@ -0,0 +1,69 @@
+"""
+Local stand-in for the finance.cs50.io quote API.
+
+    python benchmarks/quote_stub.py [port] [delay-seconds]
+
+Answers GET /quote?symbol=XYZ after `delay` seconds with a fixed payload, and
+counts the requests it served.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class QuoteStub(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024       # cientos de clientes conectando a la vez no deben quedarse esperando el SYN
+
+    def __init__(self, port=0, delay=0.0):
+        super().__init__(("127.0.0.1", port), QuoteHandler)
+        self.delay = delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):     # un cliente que dejo de esperar (timeout) no es un fallo del stub
+            super().handle_error(request, client_address)
+
+
+class QuoteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with self.server._lock:
+            self.server.requests += 1
+        time.sleep(self.server.delay)
+
+        url = urlparse(self.path)
+        symbol = parse_qs(url.query).get("symbol", [""])[0]
+        if url.path != "/quote" or not symbol:
+            self.send_error(404)
+            return
+
+        body = json.dumps({"companyName": f"{symbol} Inc.", "latestPrice": 100.0, "symbol": symbol}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8001
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    QuoteStub(port, delay).serve_forever()
@@ -0,0 +1,93 @@
+"""
+Scripted traffic for the benchmark suite.
+
+Each scenario logs in (or not) once per client in setup() and then yields
+(method, url, form data) tuples from traffic(), seeded per client so every
+run sends the same traffic.
+"""
+
+import itertools
+import random
+
+from harness import BENCH_USER
+
+SEARCHES = ["creed", "call of duty", "minecraft", "halo", "far cry", "zz", "battlefield", "need for speed"]
+RAM = [1, 2, 3, 4, 6, 8, 12, 16, 32]
+
+
+class Scenario:
+    name = None
+    clients = 4
+    per_client = 100
+
+    def setup(self, http, worker):
+        pass
+
+    def generate(self, rng, worker):
+        raise NotImplementedError
+
+    def traffic(self, worker):
+        """Endless, reproducible request stream for one client."""
+        return self.generate(random.Random(f"{self.name}-{worker}"), worker)
+
+
+class AnonymousSearch(Scenario):
+    """Catalog pages and searches without a session."""
+
+    name = "anonymous_search"
+    per_client = 200
+
+    def generate(self, rng, worker):
+        while True:
+            if rng.random() < 0.5:
+                yield "POST", "/buy", {"query": rng.choice(SEARCHES)}
+            else:
+                yield "GET", f"/buy?after={rng.choice([0, 50, 100, 150])}", None
+
+
+class CompatibilityChecks(Scenario):
+    """A logged-in user trying rigs from the CPU/GPU/RAM options of history.html."""
+
+    name = "compatibility"
+    per_client = 200
+
+    def setup(self, http, worker):
+        username, password = BENCH_USER
+        http.request("POST", "/login", {"username": username, "password": password})
+
+    def generate(self, rng, worker):
+        from hardware import CPU_HIERARCHY, GPU_HIERARCHY
+
+        cpus = list(CPU_HIERARCHY)
+        gpus = list(GPU_HIERARCHY)
+        while True:
+            yield "POST", "/history", {"cpu": rng.choice(cpus), "gpu": rng.choice(gpus), "ram": str(rng.choice(RAM))}
+
+
+class LoginStorm(Scenario):
+    """Every client logging in as fast as it can, a third of them with a wrong password."""
+
+    name = "login_storm"
+    clients = 8
+    per_client = 15
+
+    def generate(self, rng, worker):
+        username, password = BENCH_USER
+        while True:
+            yield "POST", "/login", {"username": username, "password": password if rng.random() > 1 / 3 else "wrong"}
+
+
+class RegistrationBurst(Scenario):
+    """New accounts created back to back."""
+
+    name = "registration_burst"
+    clients = 8
+    per_client = 10
+
+    def generate(self, rng, worker):
+        for i in itertools.count():
+            username = f"bench-{worker}-{i}-{rng.getrandbits(32):08x}"
+            yield "POST", "/register", {"username": username, "password": "bench", "confirmation": "bench"}
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (AnonymousSearch(), CompatibilityChecks(), LoginStorm(), RegistrationBurst())}
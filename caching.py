@@ -0,0 +1,108 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from flask import current_app, make_response, request, url_for
+
+from assets import manifest
+
+
+NO_STORE = "no-cache, no-store, must-revalidate"
+REVALIDATE = "no-cache"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def cache_policy(value):
+    """Give a view its own Cache-Control for GET/HEAD; every other response stays no-store."""
+    def decorator(f):
+        f.cache_control = value
+        return f
+    return decorator
+
+
+def apply_cache_policy(response):
+    """Stamp Cache-Control according to the route that produced response."""
+    if request.endpoint == "static":
+        # Con el hash del contenido en la URL el archivo nunca cambia; sin el, el navegador revalida con ETag
+        filename = request.view_args["filename"]
+        version = request.args.get("v")
+        immutable = version is not None and version == asset_version(filename)
+        response.headers["Cache-Control"] = IMMUTABLE if immutable else REVALIDATE
+        return response
+
+    view = current_app.view_functions.get(request.endpoint)
+    policy = getattr(view, "cache_control", None)
+    if policy is None or request.method not in ("GET", "HEAD") or response.status_code not in (200, 304):
+        response.headers["Cache-Control"] = NO_STORE
+        response.headers["Expires"] = 0
+        response.headers["Pragma"] = "no-cache"
+    else:
+        response.headers["Cache-Control"] = policy
+    return response
+
+
+@lru_cache(maxsize=1024)
+def _file_hash(path, mtime):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def file_hash(path):
+    """Short content hash of a file, recomputed only when its mtime changes."""
+    return _file_hash(path, os.stat(path).st_mtime_ns)
+
+
+def asset_version(filename):
+    """Content hash of a file under the static folder, or None if it doesn't exist."""
+    entry = manifest()["files"].get(filename)
+    if entry is not None:
+        return entry["hash"]            # calculado al construir los assets, cubre tambien sus variantes
+    try:
+        return file_hash(os.path.join(current_app.static_folder, filename))
+    except (OSError, ValueError):
+        return None
+
+
+def static_url(filename):
+    """URL for a static file with its content hash, so it can be cached forever."""
+    version = asset_version(filename)
+    if version is None:
+        return url_for("static", filename=filename)
+    return url_for("static", filename=filename, v=version)
+
+
+def templates_version():
+    """Hash of every template, so a deploy that changes a page also changes its ETag."""
+    folder = os.path.join(current_app.root_path, current_app.template_folder)
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(folder)):
+        digest.update(file_hash(os.path.join(folder, name)).encode())
+    return digest.hexdigest()[:12]
+
+
+def templates_modified():
+    """Latest change time of any template, in whole seconds like a Last-Modified header."""
+    folder = os.path.join(current_app.root_path, current_app.template_folder)
+    mtime = max(entry.stat().st_mtime for entry in os.scandir(folder))
+    return datetime.fromtimestamp(int(mtime), timezone.utc)
+
+
+def conditional(etag, last_modified, render):
+    """
+    Answer 304 Not Modified when the client's copy is current.
+
+    last_modified must move whenever etag does, or a client revalidating
+    with If-Modified-Since keeps a stale copy: a page rendered from templates
+    passes the later of its data's and templates_modified(). render() is only
+    called when a full response is needed.
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)      # la version comprimida lleva el mismo ETag, marcado como debil
+    else:
+        fresh = bool(request.if_modified_since and last_modified and request.if_modified_since >= last_modified)
+
+    response = current_app.response_class(status=304) if fresh else make_response(render())
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
@@ -0,0 +1,480 @@
+import json
+import sqlite3
+import sys
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from enum import Enum
+
+from advisor import UpgradeAdvisor
+from batch import TierArrays, load_numpy, pack_positions
+from cache import LRUCache
+from hardware import HIERARCHY_VERSION, cpu_ranking, gpu_ranking
+from metrics import timed
+from search import GRAM, grams, normalize
+
+
+# Las categorias son las de Category; una fila con otra haria fallar Game.from_row en cada pagina que la incluya
+GAMES_COLUMNS = """(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    category TEXT NOT NULL CHECK (category IN ('Bajo', 'Medio', 'Alto', 'Ultra')),
+    cpu TEXT NOT NULL,
+    cpu_key TEXT NOT NULL,
+    cpu_tier INTEGER NOT NULL,
+    gpu TEXT NOT NULL,
+    gpu_key TEXT NOT NULL,
+    gpu_tier INTEGER NOT NULL,
+    ram INTEGER NOT NULL,
+    image TEXT NOT NULL,
+    gram_count INTEGER NOT NULL
+)"""
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS games {GAMES_COLUMNS};
+CREATE INDEX IF NOT EXISTS games_name ON games (name_key);
+CREATE INDEX IF NOT EXISTS games_cpu ON games (cpu_tier, cpu_key);
+CREATE INDEX IF NOT EXISTS games_gpu ON games (gpu_tier, gpu_key);
+CREATE INDEX IF NOT EXISTS games_ram ON games (ram);
+
+CREATE TABLE IF NOT EXISTS game_grams (
+    gram TEXT NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    PRIMARY KEY (gram, game_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gram_stats (
+    gram TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL,
+    hierarchy_version INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL DEFAULT 0,
+    writing INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO catalog_meta (id, version, hierarchy_version) VALUES (1, 0, 0);
+
+-- name_key, gram_count, the n-grams and the tiers are computed in Python (search.py, hardware.py), so rows are
+-- only added, renamed or re-tiered through import_catalog() and save_game(), which set catalog_meta.writing
+-- inside their transaction. Deletes and changes to category (checked against Category), ram or image need
+-- nothing derived and are free.
+DROP TRIGGER IF EXISTS games_insert_guard;
+CREATE TRIGGER games_insert_guard BEFORE INSERT ON games
+WHEN (SELECT writing FROM catalog_meta) = 0
+BEGIN
+    SELECT RAISE(ABORT, 'insert games with catalog.save_game() or catalog.import_catalog()');
+END;
+DROP TRIGGER IF EXISTS games_update_guard;
+CREATE TRIGGER games_update_guard
+BEFORE UPDATE OF name, name_key, cpu, cpu_key, cpu_tier, gpu, gpu_key, gpu_tier, gram_count ON games
+WHEN (SELECT writing FROM catalog_meta) = 0
+BEGIN
+    SELECT RAISE(ABORT, 'change game names and hardware with catalog.save_game()');
+END;
+
+DROP TRIGGER IF EXISTS games_insert;
+CREATE TRIGGER games_insert AFTER INSERT ON games
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CAST(strftime('%s', 'now') AS INTEGER);
+END;
+DROP TRIGGER IF EXISTS games_update;
+CREATE TRIGGER games_update AFTER UPDATE ON games
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CAST(strftime('%s', 'now') AS INTEGER);
+END;
+DROP TRIGGER IF EXISTS games_delete;
+CREATE TRIGGER games_delete AFTER DELETE ON games
+BEGIN
+    UPDATE gram_stats SET df = df - 1 WHERE gram IN (SELECT gram FROM game_grams WHERE game_id = old.id);
+    DELETE FROM game_grams WHERE game_id = old.id;
+    UPDATE catalog_meta SET version = version + 1, updated_at = CAST(strftime('%s', 'now') AS INTEGER);
+END;
+"""
+
+
+def create_schema(connection):
+    """Create the catalog tables, or bring ones made by an older SCHEMA up to date."""
+    cursor = connection.cursor()
+    cursor.row_factory = None                       # tuplas tambien con las conexiones de database.Database
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(catalog_meta)")]
+    if columns and "updated_at" not in columns:
+        connection.execute("ALTER TABLE catalog_meta ADD COLUMN updated_at INTEGER NOT NULL DEFAULT 0")
+    if columns and "writing" not in columns:
+        connection.execute("ALTER TABLE catalog_meta ADD COLUMN writing INTEGER NOT NULL DEFAULT 0")
+    games = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'games'").fetchone()
+    if games and "CHECK (category" not in games[0]:
+        # SQLite no anade un CHECK a una tabla existente: se copia a una nueva; SCHEMA recrea luego indices y triggers
+        connection.executescript(f"""
+            BEGIN;
+            CREATE TABLE games_new {GAMES_COLUMNS};
+            INSERT INTO games_new SELECT * FROM games;
+            DROP TABLE games;
+            ALTER TABLE games_new RENAME TO games;
+            COMMIT;
+        """)
+    connection.executescript(SCHEMA)
+
+
+@contextmanager
+def _writing(connection):
+    """A transaction in which the guard triggers of SCHEMA let the games table be written."""
+    with connection:
+        connection.execute("UPDATE catalog_meta SET writing = 1")
+        yield connection
+        connection.execute("UPDATE catalog_meta SET writing = 0")     # nunca se confirma a 1: si algo falla se deshace todo
+
+
+def _write_game(connection, category, game, game_id=None, stats=True):
+    """
+    Insert game, or replace row game_id, with the columns and n-grams derived
+    from it; returns its id. With stats=False gram_stats is left for the
+    caller to rebuild.
+    """
+    category = Category(category)                   # ValueError si no es una de las categorias
+    name_key = normalize(game["name"])
+    name_grams = grams(name_key)
+    cpu_key, cpu_tier = cpu_ranking.resolve(game["cpu"])
+    gpu_key, gpu_tier = gpu_ranking.resolve(game["gpu"])
+    row = (game["name"], name_key, category.value, game["cpu"], cpu_key, cpu_tier,
+           game["gpu"], gpu_key, gpu_tier, int(game["ram"]), game["image"], len(name_grams))
+    if game_id is None:
+        game_id = connection.execute(
+            "INSERT INTO games (name, name_key, category, cpu, cpu_key, cpu_tier, gpu, gpu_key, gpu_tier, ram, image, gram_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row).lastrowid
+    else:
+        updated = connection.execute(
+            "UPDATE games SET name = ?, name_key = ?, category = ?, cpu = ?, cpu_key = ?, cpu_tier = ?, "
+            "gpu = ?, gpu_key = ?, gpu_tier = ?, ram = ?, image = ?, gram_count = ? WHERE id = ?", (*row, game_id))
+        if not updated.rowcount:
+            raise KeyError(game_id)
+        if stats:
+            connection.execute("UPDATE gram_stats SET df = df - 1 WHERE gram IN (SELECT gram FROM game_grams WHERE game_id = ?)",
+                               (game_id,))
+        connection.execute("DELETE FROM game_grams WHERE game_id = ?", (game_id,))
+    connection.executemany("INSERT INTO game_grams (gram, game_id) VALUES (?, ?)", ((gram, game_id) for gram in name_grams))
+    if stats:
+        connection.executemany("INSERT INTO gram_stats (gram, df) VALUES (?, 1) ON CONFLICT (gram) DO UPDATE SET df = df + 1",
+                               ((gram,) for gram in name_grams))
+    return game_id
+
+
+def import_catalog(path, games):
+    """Replace the games table in the SQLite file at path with a {category: [game, ...]} dict."""
+    connection = sqlite3.connect(path)
+    try:
+        create_schema(connection)
+        with _writing(connection):
+            connection.execute("DELETE FROM games")
+            connection.execute("DELETE FROM sqlite_sequence WHERE name = 'games'")
+            for category, games_list in games.items():
+                for game in games_list:
+                    _write_game(connection, category, game, stats=False)
+            connection.execute("DELETE FROM gram_stats")
+            connection.execute("INSERT INTO gram_stats (gram, df) SELECT gram, COUNT(*) FROM game_grams GROUP BY gram")
+            connection.execute("UPDATE catalog_meta SET hierarchy_version = ?", (HIERARCHY_VERSION,))
+    finally:
+        connection.close()
+
+
+def save_game(path, category, game, game_id=None):
+    """
+    Add one game ({"name", "cpu", "gpu", "ram", "image"}) under category to
+    the catalog in the SQLite file at path, or replace the game game_id
+    (KeyError if there is none). Returns the id of the row; a category that
+    is not a Category raises ValueError.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        create_schema(connection)
+        with _writing(connection):
+            return _write_game(connection, category, game, game_id)
+    finally:
+        connection.close()
+
+
+class Category(str, Enum):
+    """Requirement level a game is listed under; the CHECK on games.category lists the same values."""
+
+    BAJO = "Bajo"
+    MEDIO = "Medio"
+    ALTO = "Alto"
+    ULTRA = "Ultra"
+
+    def __str__(self):
+        return self.value
+
+
+class Game:
+    """
+    One catalog entry.
+
+    Records keep no per-instance __dict__, share one interned copy of each
+    hardware name and key, hold RAM and tiers as ints and their category as a
+    Category member. Templates read them by attribute, as they did the dicts.
+    """
+
+    __slots__ = ("id", "name", "category", "cpu", "gpu", "ram", "image", "cpu_key", "cpu_tier", "gpu_key", "gpu_tier")
+
+    def __init__(self, id, name, category, cpu, gpu, ram, image, cpu_key, cpu_tier, gpu_key, gpu_tier):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.cpu = cpu
+        self.gpu = gpu
+        self.ram = ram
+        self.image = image
+        self.cpu_key = cpu_key
+        self.cpu_tier = cpu_tier
+        self.gpu_key = gpu_key
+        self.gpu_tier = gpu_tier
+
+    @classmethod
+    def from_row(cls, row):
+        intern = sys.intern
+        return cls(row["id"], row["name"], Category(row["category"]), intern(row["cpu"]), intern(row["gpu"]),
+                   row["ram"], row["image"], intern(row["cpu_key"]), row["cpu_tier"], intern(row["gpu_key"]), row["gpu_tier"])
+
+    def to_json(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category.value,
+            "cpu": self.cpu,
+            "gpu": self.gpu,
+            "ram": self.ram,
+            "image": self.image,
+        }
+
+    def __repr__(self):
+        return f"Game({self.id}, {self.name!r})"
+
+
+class GameRepository:
+    """
+    Read access to the games table.
+
+    Compatibility and search filters run in SQL. Results are kept in two LRU
+    caches, one for compatibility checks keyed by the normalized
+    (cpu, gpu, ram) triple and one for listings and searches. Both are dropped
+    whenever catalog_meta changes: its triggers bump the version on every
+    insert, update or delete, and a new hierarchy version re-tiers the table.
+    catalog_meta is polled at most once every `check_interval` seconds.
+    """
+
+    COLUMNS = "id, name, category, cpu, gpu, ram, image, cpu_key, cpu_tier, gpu_key, gpu_tier"
+
+    def __init__(self, db, cache_size=256, compat_cache_size=1024, check_interval=1.0):
+        self.db = db
+        self.check_interval = check_interval
+        self.query_cache = LRUCache(cache_size)
+        self.compat_cache = LRUCache(compat_cache_size)
+        self._version = None
+        self.updated_at = None
+        self._ram_steps = []
+        self._arrays = None
+        self._advisor = None
+        self._checked_at = float("-inf")
+
+    def all(self):
+        """Every game, in catalog order."""
+        return self._cached(self.query_cache, ("all",), self._load_all)
+
+    @timed("catalog.page")
+    def page(self, after=0, limit=50):
+        """
+        Up to limit games with an id greater than the cursor `after`, in catalog
+        order, and the cursor of the next page (None on the last one).
+        """
+        games = self._cached(self.query_cache, ("page", after, limit), lambda: self._load_page(after, limit + 1))
+        return games[:limit], games[limit - 1].id if len(games) > limit else None
+
+    def iter_all(self, batch=500):
+        """Every game in catalog order, read `batch` rows at a time and never cached."""
+        after = 0
+        while True:
+            games = self._load_page(after, batch)
+            yield from games
+            if len(games) < batch:
+                return
+            after = games[-1].id
+
+    @timed("catalog.compatible")
+    def compatible(self, cpu, gpu, ram):
+        """Games that run on (cpu, gpu, ram): same part or a strictly higher tier, and enough RAM."""
+        cpu_key, cpu_tier = cpu_ranking.resolve(cpu)
+        gpu_key, gpu_tier = gpu_ranking.resolve(gpu)
+        self._check_version()
+
+        # Entre dos valores de RAM del catalogo el resultado no cambia, asi que se usa el escalon inferior como clave
+        ram = int(ram)
+        step = bisect_right(self._ram_steps, ram)
+        if step:
+            ram = self._ram_steps[step - 1]
+
+        return self._cached(self.compat_cache, (cpu_key, gpu_key, ram),
+                            lambda: self._load_compatible(cpu_key, cpu_tier, gpu_key, gpu_tier, ram))
+
+    @timed("catalog.compatible_many")
+    def compatible_many(self, rigs, bitmap=False):
+        """
+        compatible() for a batch of (cpu, gpu, ram) rigs, one entry per rig.
+
+        Each entry lists the compatible game ids, or with bitmap=True is a
+        bitmap over the catalog in id order. With NumPy the whole batch is
+        evaluated at once over TierArrays; without it each rig goes through
+        compatible().
+        """
+        self._check_version()
+        if load_numpy() is None:
+            results = [[game.id for game in self.compatible(cpu, gpu, ram)] for cpu, gpu, ram in rigs]
+            if not bitmap:
+                return results
+            positions = self._positions()
+            return [pack_positions((positions[game_id] for game_id in ids), len(positions)) for ids in results]
+
+        arrays = self._tier_arrays()
+        resolved = [(*cpu_ranking.resolve(cpu), *gpu_ranking.resolve(gpu), int(ram)) for cpu, gpu, ram in rigs]
+        convert = arrays.bitmap if bitmap else arrays.ids_for
+        return [convert(mask) for mask in arrays.masks(resolved)]
+
+    def advisor(self):
+        """UpgradeAdvisor for the catalog currently served, rebuilt when it changes."""
+        self._check_version()
+        advisor = self._advisor
+        if advisor is None:
+            advisor = self._advisor = UpgradeAdvisor(self.all())
+        return advisor
+
+    def warm(self, rigs):
+        """Precompute compatibility results for an iterable of (cpu, gpu, ram)."""
+        for cpu, gpu, ram in rigs:
+            self.compatible(cpu, gpu, ram)
+
+    def version(self):
+        """(catalog version, hierarchy version) of the data currently served."""
+        self._check_version()
+        return self._version
+
+    def stats(self):
+        """Counters for both result caches."""
+        return {"compatible": self.compat_cache.stats(), "query": self.query_cache.stats()}
+
+    @timed("catalog.search")
+    def search(self, query, fuzzy=False, limit=20):
+        """
+        Games whose name contains query, in catalog order.
+
+        The query is casefolded and accent-stripped like the stored names and
+        matched as plain text. With fuzzy=True a query with no exact match falls
+        back to the names sharing the most n-grams with it, best first.
+        """
+        query = normalize(query.strip())
+        return self._cached(self.query_cache, ("search", query, fuzzy, limit), lambda: self._search(query, fuzzy, limit))
+
+    def _search(self, query, fuzzy, limit):
+        games = self._load_matches(query)
+        if games or not fuzzy or len(query) < GRAM:
+            return games
+        return self._load_fuzzy(query, limit)
+
+    # Cada _load_* lee de SQL lo que luego se guarda en cache; SnapshotRepository los sustituye
+
+    def _load_all(self):
+        return self._games(f"SELECT {self.COLUMNS} FROM games ORDER BY id")
+
+    def _load_page(self, after, limit):
+        return self._games(f"SELECT {self.COLUMNS} FROM games WHERE id > ? ORDER BY id LIMIT ?", after, limit)
+
+    def _load_compatible(self, cpu_key, cpu_tier, gpu_key, gpu_tier, ram):
+        return self._games(
+            f"SELECT {self.COLUMNS} FROM games "
+            "WHERE (cpu_tier < ? OR cpu_key = ?) AND (gpu_tier < ? OR gpu_key = ?) AND ram <= ? "
+            "ORDER BY id",
+            cpu_tier, cpu_key, gpu_tier, gpu_key, ram)
+
+    def _load_matches(self, query):
+        if len(query) < GRAM:
+            # Demasiado corta para el indice de n-gramas: basta con instr sobre los nombres normalizados
+            return self._games(f"SELECT {self.COLUMNS} FROM games WHERE instr(name_key, ?) > 0 ORDER BY id", query)
+
+        # Solo se recorre la lista del n-grama menos frecuente; instr confirma la coincidencia completa.
+        # Los n-gramas van como un unico array JSON para no chocar con el limite de variables de SQLite
+        query_grams = list(grams(query))
+        return self._games(
+            f"SELECT {self.COLUMNS} FROM games WHERE id IN ("
+            "SELECT game_id FROM game_grams WHERE gram = (SELECT gram FROM gram_stats "
+            "WHERE gram IN (SELECT value FROM json_each(?)) ORDER BY df LIMIT 1)"
+            ") AND (SELECT COUNT(*) FROM gram_stats WHERE gram IN (SELECT value FROM json_each(?)) AND df > 0) = ? "
+            "AND instr(name_key, ?) > 0 ORDER BY id",
+            json.dumps(query_grams), json.dumps(query_grams), len(query_grams), query)
+
+    def _load_fuzzy(self, query, limit):
+        # Dice similarity between the query's n-grams and each name's
+        query_grams = list(grams(query))
+        return self._games(
+            f"SELECT {self.COLUMNS} FROM game_grams "
+            "JOIN games ON games.id = game_grams.game_id WHERE gram IN (SELECT value FROM json_each(?)) GROUP BY games.id "
+            "HAVING 2.0 * COUNT(*) / (? + gram_count) >= 0.4 "
+            "ORDER BY 2.0 * COUNT(*) / (? + gram_count) DESC, games.id LIMIT ?",
+            json.dumps(query_grams), len(query_grams), len(query_grams), limit)
+
+    def _tier_arrays(self):
+        if self._arrays is None:
+            self._arrays = TierArrays(
+                self.db.execute("SELECT id, cpu_key, cpu_tier, gpu_key, gpu_tier, ram FROM games ORDER BY id"))
+        return self._arrays
+
+    def _positions(self):
+        """{game id: position in catalog order}."""
+        return {row["id"]: i for i, row in enumerate(self.db.execute("SELECT id FROM games ORDER BY id"))}
+
+    def _games(self, sql, *args):
+        return [Game.from_row(row) for row in self.db.execute(sql, *args)]
+
+    def _cached(self, cache, key, load):
+        self._check_version()
+        # La version va en la clave: si otro hilo ve una version nueva y vacia las caches mientras esta carga,
+        # el resultado viejo queda guardado bajo la version anterior y ninguna lectura lo vuelve a pedir
+        key = (self._version, *key)
+        rows = cache.get(key)
+        if rows is None:
+            rows = load()
+            cache.put(key, rows)
+        return rows
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._version is not None:
+            return
+        self._checked_at = now
+
+        meta = self.db.execute("SELECT version, hierarchy_version, updated_at FROM catalog_meta")[0]
+        if meta["hierarchy_version"] != HIERARCHY_VERSION:
+            self._retier()
+            return self._check_version()
+        version = (meta["version"], meta["hierarchy_version"])
+        if version != self._version:
+            self.query_cache.clear()
+            self.compat_cache.clear()
+            self._arrays = None
+            self._advisor = None
+            self._ram_steps = [row["ram"] for row in self.db.execute("SELECT DISTINCT ram FROM games ORDER BY ram")]
+            self._version = version
+            self.updated_at = datetime.fromtimestamp(meta["updated_at"], timezone.utc)
+
+    def _retier(self):
+        """Recompute stored cpu/gpu keys and tiers after the hardware tables change."""
+        with self.db.connection() as connection:
+            create_schema(connection)               # un archivo de un SCHEMA anterior no tiene catalog_meta.writing
+        with self.db.transaction():
+            self.db.execute("UPDATE catalog_meta SET writing = 1")        # ver los triggers de guarda en SCHEMA
+            for row in self.db.execute("SELECT DISTINCT cpu FROM games"):
+                self.db.execute("UPDATE games SET cpu_key = ?, cpu_tier = ? WHERE cpu = ?", *cpu_ranking.resolve(row["cpu"]), row["cpu"])
+            for row in self.db.execute("SELECT DISTINCT gpu FROM games"):
+                self.db.execute("UPDATE games SET gpu_key = ?, gpu_tier = ? WHERE gpu = ?", *gpu_ranking.resolve(row["gpu"]), row["gpu"])
+            self.db.execute("UPDATE catalog_meta SET hierarchy_version = ?, writing = 0", HIERARCHY_VERSION)
+        self._checked_at = float("-inf")
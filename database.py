@@ -0,0 +1,180 @@
+"""Pooled SQLite access for finance.db, a drop-in replacement for cs50's SQL."""
+
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from metrics import timed
+
+
+# Un ? fuera de comillas es un parametro; lo que esta entre comillas se copia tal cual
+_PLACEHOLDER = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\?")
+
+
+def _dict_factory(cursor, row):
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+def _expand(sql, args):
+    """Turn each list or tuple argument into one ? per element, like cs50 does for IN (?)."""
+    args = iter(args)
+    params = []
+
+    def replace(match):
+        if match.group() != "?":
+            return match.group()
+        value = next(args)
+        if isinstance(value, (list, tuple)):
+            params.extend(value)
+            return ", ".join("?" * len(value))
+        params.append(value)
+        return "?"
+
+    return _PLACEHOLDER.sub(replace, sql), params
+
+
+class Database:
+    """
+    A SQLite file shared by the request threads.
+
+    Connections are opened on demand and up to `pool_size` idle ones are kept
+    for reuse. Each is tuned with PRAGMAS and keeps its last
+    `cached_statements` SQL strings prepared, so the constant queries used by
+    the app are compiled once per connection. The file is switched to WAL, so
+    readers never wait for the writer.
+
+    execute() follows cs50's SQL.execute: a list of dicts for queries, the new
+    id for INSERT, the row count otherwise, and ValueError when a constraint
+    fails. Statements that must run together go inside transaction().
+    """
+
+    PRAGMAS = {
+        "synchronous": "NORMAL",
+        "cache_size": -16000,       # KiB
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,       # ms
+    }
+
+    def __init__(self, path, pool_size=8, cached_statements=128, **pragmas):
+        self.path = path
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self.pragmas = {**self.PRAGMAS, **pragmas}
+        self._pool = queue.LifoQueue()
+        self._local = threading.local()
+
+        with self.connection() as connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False, cached_statements=self.cached_statements)
+        connection.row_factory = _dict_factory
+        for name, value in self.pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """A connection for the current thread: the one of its open transaction, or one from the pool."""
+        held = getattr(self._local, "connection", None)
+        if held is not None:
+            yield held
+            return
+
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(connection)
+            else:
+                connection.close()
+
+    @contextmanager
+    def transaction(self, mode="IMMEDIATE"):
+        """
+        Run the enclosed execute() calls of this thread in one transaction.
+
+        The default IMMEDIATE takes the write lock up front; mode="DEFERRED"
+        only reads a consistent snapshot and never waits on or blocks the
+        writer in WAL mode. Commits on success and rolls back on error;
+        nested blocks join the outer transaction.
+        """
+        if getattr(self._local, "connection", None) is not None:
+            yield self
+            return
+
+        with self.connection() as connection:
+            connection.execute(f"BEGIN {mode}")
+            self._local.connection = connection
+            try:
+                yield self
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+            finally:
+                self._local.connection = None
+
+    def close(self):
+        """Close the idle pooled connections, e.g. before forking workers; new ones open on demand."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    @timed("db")
+    def execute(self, sql, *args):
+        """Run one statement with ? parameters; list and tuple arguments expand in place."""
+        if any(isinstance(arg, (list, tuple)) for arg in args):
+            sql, args = _expand(sql, args)
+
+        with self.connection() as connection:
+            try:
+                cursor = connection.execute(sql, args)
+            except sqlite3.IntegrityError as e:
+                raise ValueError(e) from e
+
+            if cursor.description is not None:
+                return cursor.fetchall()
+            if sql.lstrip()[:6].upper() == "INSERT":
+                return cursor.lastrowid
+            return cursor.rowcount
+
+
+class Users:
+    """The users table through a few fixed statements, prepared once per connection."""
+
+    BY_USERNAME = "SELECT * FROM users WHERE username = ?"
+    HASH_BY_ID = "SELECT hash FROM users WHERE id = ?"
+    INSERT = "INSERT INTO users (username, hash) VALUES (?, ?)"
+    SET_HASH = "UPDATE users SET hash = ? WHERE id = ?"
+
+    def __init__(self, db):
+        self.db = db
+
+    def by_username(self, username):
+        """The user row for username, or None."""
+        rows = self.db.execute(self.BY_USERNAME, username)
+        return rows[0] if rows else None
+
+    def hash_of(self, user_id):
+        """Stored password hash of user_id, or None."""
+        rows = self.db.execute(self.HASH_BY_ID, user_id)
+        return rows[0]["hash"] if rows else None
+
+    def create(self, username, pwhash):
+        """Insert a user and return its id; raises ValueError if the username is taken."""
+        return self.db.execute(self.INSERT, username, pwhash)
+
+    def set_hash(self, user_id, pwhash):
+        self.db.execute(self.SET_HASH, pwhash, user_id)
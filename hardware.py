@@ -0,0 +1,212 @@
+"""
+Hardware rankings used to compare a rig against game requirements.
+
+The CPU/GPU hierarchies are plain tables. On the first lookup every spelling
+(table entries, aliases and their case/whitespace variants) is resolved to a
+canonical key and rank, so later lookups are a single dict access.
+"""
+
+from functools import cached_property
+
+# Bump whenever a table or alias below changes, so cached results keyed on the
+# rankings can tell they are stale.
+HIERARCHY_VERSION = 2
+
+CPU_HIERARCHY = {
+    "Pentium 90": 1,
+    "Pentium200MHz": 2,
+    "1 GHZ": 4,
+    "1.2 GHZ": 5,
+    "1.4 GHZ": 7,
+    "1.6 GHZ": 8,
+    "1.7 GHZ": 9,
+    "1.8 GHZ": 10,
+    "Intel 2.0 GHZ": 11,
+    "AMD at 2.8 GHz": 12,
+    "2.4 GHZ": 13,
+    "3.0 GHZ": 14,
+    "Pentium II": 14,
+    "Intel Pentium III": 15,
+    "Intel Pentium 4": 16,
+    "Intel Pentium E2180": 17,
+    "Intel Dual Core": 18,
+    "AMD Athlon Processor": 19,
+    "AMD Athlon 64": 20,
+    "AMD Athlon 64 X2": 21,
+    "AMD Athlon II": 22,
+    "AMD Athlon II X4 620 2.6 GHz": 23,
+    "AMD Phenom II X4 940": 24,
+    "Intel Core 2 Duo": 25,
+    "Intel Core 2 Duo E4500": 27,
+    "Intel Core 2 Duo E5200": 28,
+    "Intel Core 2 Duo E6600": 29,
+    "Intel Core 2 Duo E6700": 30,
+    "Intel Core 2 Duo E6750": 31,
+    "Intel Core 2 Duo E6850": 32,
+    "Intel Core 2 Duo E8200": 33,
+    "Intel Core2 Duo E8400": 34,
+    "2.4 GHz Dual Core Processor": 35,
+    "Intel Core 2 Quad": 36,
+    "AMD FX 4300": 37,
+    "Intel Core i3": 37,
+    "AMD FX 6300": 37,
+    "AMD FX 8350": 38,
+    "Intel Core i5": 38,
+    "AMD FX 9590": 39,
+    "Intel Core i7": 39,
+    "Intel Core i9": 40,
+}
+
+GPU_HIERARCHY = {
+    "OpenGL 1.4": 1,
+    "2 MB of vRAM": 2,
+    "4 MB of vRAM": 3,
+    "8 MB of vRAM": 4,
+    "32 MB of vRAM": 5,
+    "Gráfica 3D compatible con DirectX 7": 6,
+    "NVIDIA GeForce 6100": 7,
+    "NVIDIA GeForce FX 5200": 8,
+    "NVIDIA GeForce 6600": 9,
+    "NVIDIA GeForce 6600GT": 10,
+    "NVIDIA GeForce 7600": 11,
+    "NVIDIA GeForce 7600GT": 12,
+    "NVIDIA GeForce 240 GT": 13,
+    "NVIDIA GeForce GT 420": 14,
+    "Geforce GT 430": 15,
+    "NVIDIA GeForce 450 GTS": 16,
+    "OpenGL 2.0 compatible": 17,
+    "OpenGL 3.0 Support": 18,
+    "Tarjeta DirectX con resolución de 800 x 600": 19,
+    "Radeon X1000": 20,
+    "64 MB of vRAM": 21,
+    "128 MB of vRAM": 22,
+    "256 MB of vRAM": 23,
+    "256 MB compatible con DirectX 9.0b": 24,
+    "32 MB compatible con DirectX 9.0b": 25,
+    "512 MB of vRAM": 25,
+    "1 GB of vRAM": 26,
+    "NVIDIA GeForce 8600": 26,
+    "NVIDIA GeForce 8600GT": 27,
+    "NVIDIA GeForce 7800 GT": 28,
+    "NVIDIA GeForce 7800 GTX": 29,
+    "NVIDIA GeForce 8800": 30,
+    "NVIDIA GeForce 8800GT": 31,
+    "NVIDIA GeForce 8800GTS": 32,
+    "NVIDIA GeForce 9600GT": 33,
+    "NVIDIA GeForce 9800": 34,
+    "NVIDIA GeForce 9800 GT": 35,
+    "NVIDIA GeForce 9800GTX": 36,
+    "ATI Radeon HD 3870": 37,
+    "Nvidia GTS 260": 38,
+    "Nvidia Geforce GTX 260": 38,
+    "NVIDIA GTX 500": 39,
+    "NVIDIA GeForce GTX 460": 40,
+    "NVIDIA GeForce GTX 465": 41,
+    "NVIDIA GeForce GTX 470": 42,
+    "NVIDIA GeForce GTS 450": 43,
+    "Intel HD 3000": 44,
+    "NVIDIA GTX 580": 45,
+    "GeForce GT 560 Ti": 46,
+    "NVIDIA GTX 600": 47,
+    "NVIDIA GTX 650": 48,
+    "NVIDIA GeForce GTX 660": 49,
+    "NVIDIA GeForce GTX 670": 50,
+    "NVIDIA GeForce GTX 680": 51,
+    "NVIDIA GTX 750": 52,
+    "NVIDIA GeForce GTX 750 Ti": 53,
+    "NVIDIA GTX 760": 54,
+    "NVIDIA GeForce GTX 780": 55,
+    "AMD Radeon RX Vega 6": 56,
+    "NVIDIA GTX 960": 57,
+    "NVIDIA GTX 970": 58,
+    "AMD Radeon RX 460": 59,
+    "AMD Radeon RX 560": 60,
+    "NVIDIA GTX 1050": 61,
+    "NVIDIA GeForce GTX 1050 Ti": 62,
+    "AMD Radeon RX 580": 63,
+    "AMD Radeon RX 590": 64,
+    "NVIDIA GTX 1060": 65,
+    "NVIDIA GTX 1070": 66,
+    "NVIDIA GeForce GTX 1070 Ti": 67,
+    "NVIDIA GTX 1650": 68,
+    "NVIDIA RTX 2060": 69,
+    "NVIDIA RTX 2060 Super": 70,
+    "NVIDIA RTX 2070": 71,
+    "NVIDIA RTX 3080": 72,
+}
+
+# Other spellings of parts that already appear in the tables above.
+CPU_ALIASES = {
+    "Intel CoreTM2 Duo": "Intel Core 2 Duo",
+    "Intel 2 Core Duo": "Intel Core 2 Duo",
+    "Pentium III": "Intel Pentium III",
+}
+
+GPU_ALIASES = {
+    "NIDIA GeForce 7800 GT": "NVIDIA GeForce 7800 GT",
+    "GeForce 7800 GTX": "NVIDIA GeForce 7800 GTX",
+    "GeForce 240 GT": "NVIDIA GeForce 240 GT",
+    "NVIDIA GeForce GTX 600": "NVIDIA GTX 600",
+    "NVIDIA GeForce GTX GTX 660": "NVIDIA GeForce GTX 660",
+    "GeForce 750 Ti": "NVIDIA GeForce GTX 750 Ti",
+    "GeForce GTX 760": "NVIDIA GTX 760",
+    "NVIDIA GeForce GTX 970": "NVIDIA GTX 970",
+    "Nvidia GTX 470": "NVIDIA GeForce GTX 470",
+    "GeForce GTX 1050": "NVIDIA GTX 1050",
+    "NVIDIA GeForce GTX 1650": "NVIDIA GTX 1650",
+    "256 MB de vRAM": "256 MB of vRAM",
+    "256 MB VRAM": "256 MB of vRAM",
+}
+
+
+def normalize(name):
+    """Fold case, trademark marks and whitespace out of a hardware name."""
+    return "".join(name.casefold().replace("™", "").split())
+
+
+class Ranking:
+    """Rank lookups for one hardware hierarchy."""
+
+    def __init__(self, hierarchy, aliases, version=HIERARCHY_VERSION):
+        self.hierarchy = hierarchy
+        self.aliases = aliases
+        self.version = version
+
+    @cached_property
+    def _resolved(self):
+        """Every spelling, exact and normalized, mapped to (key, rank); built on the first lookup."""
+        resolved = {}
+
+        def add(name, value):
+            resolved[name] = value
+            resolved.setdefault(normalize(name), value)
+
+        for name, rank in self.hierarchy.items():
+            add(name, (normalize(name), rank))
+        for alias, name in self.aliases.items():
+            add(alias, resolved[name])
+        return resolved
+
+    def warm(self):
+        """Build the lookup table now instead of on the first lookup; returns it."""
+        return self._resolved
+
+    def resolve(self, name):
+        """Return (key, rank); parts outside the hierarchy rank 0."""
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            if name is None:
+                return None, 0
+            resolved = self._resolved.get(normalize(name)) or (normalize(name), 0)
+        return resolved
+
+    def key(self, name):
+        """Canonical key: two spellings of the same part share it."""
+        return self.resolve(name)[0]
+
+    def rank(self, name):
+        return self.resolve(name)[1]
+
+
+cpu_ranking = Ranking(CPU_HIERARCHY, CPU_ALIASES)
+gpu_ranking = Ranking(GPU_HIERARCHY, GPU_ALIASES)
@@ -1,7 +1,6 @@
-import requests
-
 from flask import redirect, render_template, session
 from functools import wraps
+from markupsafe import Markup
 
 
 def apology(message, code=400):
@@ -47,21 +46,19 @@ def login_required(f):
 
 def lookup(symbol):
     """Look up quote for symbol."""
-    url = f"https://finance.cs50.io/quote?symbol={symbol.upper()}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an error for HTTP error responses
-        quote_data = response.json()
-        return {
-            "name": quote_data["companyName"],
-            "price": quote_data["latestPrice"],
-            "symbol": symbol.upper()
-        }
-    except requests.RequestException as e:
-        print(f"Request error: {e}")
-    except (KeyError, ValueError) as e:
-        print(f"Data parsing error: {e}")
-    return None
+    import quotes       # requests se importa solo cuando alguien pide una cotizacion
+    return quotes.client.lookup(symbol)
+
+
+def lookup_many(symbols):
+    """Look up quotes for several symbols in parallel; returns {SYMBOL: quote or None}."""
+    import quotes
+    return quotes.client.lookup_many(symbols)
+
+
+def select_options(values):
+    """Render values as pre-escaped <option> tags for a <select>."""
+    return Markup("\n").join(Markup('<option value="{0}">{0}</option>').format(value) for value in values)
 
 
 def usd(value):
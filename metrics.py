@@ -0,0 +1,186 @@
+"""Request and phase latency histograms, exported in the Prometheus text format."""
+
+import cProfile
+import inspect
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import before_render_template, g, request, template_rendered
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Si se observan las fases que corren ahora; con False los decoradores solo hacen una comprobacion. Cada
+# peticion lo fija con el METRICS_ENABLED de su app, asi varias apps en un proceso no se pisan; fuera de
+# una peticion (scripts, hilos propios) vale True
+recording = ContextVar("metrics_recording", default=True)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative latency histogram, one series per combination of label values."""
+
+    def __init__(self, name, help, labelnames=(), buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def lines(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            pairs = [f'{name}="{_label(value)}"' for name, value in zip(self.labelnames, labels)]
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{{{','.join(pairs + [le])}}} {cumulative}"
+            suffix = "{" + ",".join(pairs) + "}" if pairs else ""
+            yield f"{self.name}_sum{suffix} {total}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Registry:
+    """Metrics and collector callbacks rendered together by /metrics."""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect):
+        """collect() is called on every scrape and returns lines of exposition text."""
+        self.collectors.append(collect)
+
+    def render(self):
+        lines = [line for metric in self.metrics for line in metric.lines()]
+        lines += [line for collect in self.collectors for line in collect()]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+request_seconds = registry.register(Histogram(
+    "app_request_duration_seconds", "Time spent handling a request.", ("endpoint", "method", "status")))
+phase_seconds = registry.register(Histogram(
+    "app_phase_duration_seconds", "Time spent inside one phase of a request.", ("phase",)))
+
+
+def timed(phase):
+    """Decorate a function so each call is observed in app_phase_duration_seconds{phase=...}; coroutines too."""
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def awaiting(*args, **kwargs):
+                if not recording.get():
+                    return await f(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await f(*args, **kwargs)
+                finally:
+                    phase_seconds.observe(time.perf_counter() - start, phase)
+            return awaiting
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not recording.get():
+                return f(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                phase_seconds.observe(time.perf_counter() - start, phase)
+        return wrapper
+    return decorator
+
+
+def cache_lines(caches):
+    """Exposition lines for {name: LRUCache.stats()}."""
+    for counter in ("hits", "misses", "evictions"):
+        yield f"# TYPE app_cache_{counter}_total counter"
+        for name, stats in caches.items():
+            yield f'app_cache_{counter}_total{{cache="{_label(name)}"}} {stats[counter]}'
+    yield "# TYPE app_cache_size gauge"
+    for name, stats in caches.items():
+        yield f'app_cache_size{{cache="{_label(name)}"}} {stats["size"]}'
+
+
+def init_metrics(app):
+    """
+    Time every request of app, and its template rendering, when
+    app.config["METRICS_ENABLED"] is set.
+
+    With PROFILE_SAMPLE_RATE above 0 that fraction of requests also runs
+    under cProfile, one at a time, and those slower than PROFILE_THRESHOLD
+    seconds are dumped to PROFILE_DIR as <endpoint>-<timestamp>.prof.
+    The setting is per app, kept in app.extensions["metrics"].
+    """
+    enabled = app.extensions["metrics"] = app.config.get("METRICS_ENABLED", True)
+    sample_rate = app.config.get("PROFILE_SAMPLE_RATE", 0)
+    threshold = app.config.get("PROFILE_THRESHOLD", 0.5)
+    directory = app.config.get("PROFILE_DIR", "profiles")
+    profiling = threading.Lock()
+
+    @app.before_request
+    def start_timer():
+        recording.set(enabled)          # las fases de esta peticion siguen el ajuste de su app
+        if not enabled:
+            return
+        g.metrics_started = time.perf_counter()
+        g.metrics_renders = []
+        if sample_rate and random.random() < sample_rate and profiling.acquire(blocking=False):
+            g.metrics_profiler = cProfile.Profile()
+            g.metrics_profiler.enable()
+
+    @app.after_request
+    def stop_timer(response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        request_seconds.observe(elapsed, request.endpoint or "unmatched", request.method, response.status_code)
+
+        profiler = g.pop("metrics_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            profiling.release()
+            if elapsed >= threshold:
+                os.makedirs(directory, exist_ok=True)
+                profiler.dump_stats(os.path.join(directory, f"{request.endpoint}-{time.time():.6f}.prof"))
+        return response
+
+    def render_started(sender, template, context, **extra):
+        if "metrics_renders" in g:
+            g.metrics_renders.append(time.perf_counter())
+
+    def render_finished(sender, template, context, **extra):
+        if g.get("metrics_renders"):
+            phase_seconds.observe(time.perf_counter() - g.metrics_renders.pop(), "render")
+
+    before_render_template.connect(render_started, app, weak=False)
+    template_rendered.connect(render_finished, app, weak=False)
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import LRUCache
+from metrics import timed
+
+try:
+    import aiohttp
+except ImportError:     # sin aiohttp no hay modo ASGI (asgi.py); QuoteClient no lo necesita
+    aiohttp = None
+
+
+QUOTES_URL = os.environ.get("QUOTES_URL", "https://finance.cs50.io")
+
+
+def _parse(symbol, quote_data):
+    return {
+        "name": quote_data["companyName"],
+        "price": quote_data["latestPrice"],
+        "symbol": symbol
+    }
+
+
+class QuoteClient:
+    """
+    Client for the finance.cs50.io quote API.
+
+    Connections come from a pooled keep-alive session with explicit connect/read
+    timeouts. Quotes are cached per symbol for `ttl` seconds, for at most
+    `cache_size` symbols, and concurrent lookups of the same symbol share a
+    single upstream request.
+    """
+
+    def __init__(self, base_url="https://finance.cs50.io", ttl=60, connect_timeout=3.05,
+                 read_timeout=5, pool_size=10, max_workers=8, cache_size=1024):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_workers = max_workers
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._cache = LRUCache(cache_size)     # los simbolos los escribe el usuario: sin tope la cache creceria sin limite
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def lookup(self, symbol):
+        """Look up quote for symbol."""
+        symbol = symbol.upper()
+        with self._lock:
+            cached = self._cache.get(symbol)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            future = self._inflight.get(symbol)
+            leader = future is None
+            if leader:
+                future = self._inflight[symbol] = Future()
+
+        if not leader:
+            return future.result()
+
+        quote = None
+        try:
+            quote = self._fetch(symbol)
+        finally:
+            with self._lock:
+                if quote is not None:
+                    self._cache.put(symbol, (time.monotonic() + self.ttl, quote))
+                del self._inflight[symbol]
+            future.set_result(quote)
+        return quote
+
+    def lookup_many(self, symbols):
+        """Look up several symbols in parallel; returns {SYMBOL: quote or None}."""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="quotes")
+        return dict(zip(symbols, self._executor.map(self.lookup, symbols)))
+
+    @timed("quotes.fetch")
+    def _fetch(self, symbol):
+        try:
+            response = self.session.get(f"{self.base_url}/quote", params={"symbol": symbol}, timeout=self.timeout)
+            response.raise_for_status()  # Raise an error for HTTP error responses
+            return _parse(symbol, response.json())
+        except requests.RequestException as e:
+            print(f"Request error: {e}")
+        except (KeyError, ValueError) as e:
+            print(f"Data parsing error: {e}")
+        return None
+
+
+class AsyncQuoteClient:
+    """
+    QuoteClient for the event loop of the ASGI mode, on aiohttp.
+
+    Every request shares one pool of `pool_size` keep-alive connections, and
+    at most `concurrency` upstream calls are in flight at once: the others
+    wait on a semaphore rather than opening more sockets. Quotes are cached
+    and single-flighted as in QuoteClient. Create it inside the event loop
+    that will use it.
+    """
+
+    def __init__(self, base_url=QUOTES_URL, ttl=60, connect_timeout=3.05, read_timeout=5,
+                 pool_size=100, concurrency=100, cache_size=1024):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        # httpx.AsyncClient se atascaba por encima de ~50 peticiones simultaneas; el conector de aiohttp escala
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            connector=aiohttp.TCPConnector(limit=pool_size))
+        self._limit = asyncio.Semaphore(concurrency)
+        self._cache = LRUCache(cache_size)
+        self._inflight = {}
+
+    async def lookup(self, symbol):
+        """Look up quote for symbol."""
+        symbol = symbol.upper()
+        cached = self._cache.get(symbol)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(symbol)
+        if task is None:
+            task = self._inflight[symbol] = asyncio.ensure_future(self._load(symbol))
+        return await asyncio.shield(task)      # si un cliente se va, la peticion sigue para los demas que esperan
+
+    async def lookup_many(self, symbols):
+        """Look up several symbols concurrently; returns {SYMBOL: quote or None}."""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        return dict(zip(symbols, await asyncio.gather(*(self.lookup(symbol) for symbol in symbols))))
+
+    async def _load(self, symbol):
+        try:
+            quote = await self._fetch(symbol)
+            if quote is not None:
+                self._cache.put(symbol, (time.monotonic() + self.ttl, quote))
+            return quote
+        finally:
+            del self._inflight[symbol]
+
+    @timed("quotes.fetch")
+    async def _fetch(self, symbol):
+        async with self._limit:
+            try:
+                async with self.session.get(f"{self.base_url}/quote", params={"symbol": symbol},
+                                            raise_for_status=True) as response:
+                    return _parse(symbol, await response.json(content_type=None))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Request error: {e}")
+            except (KeyError, ValueError) as e:
+                print(f"Data parsing error: {e}")
+            return None
+
+    async def aclose(self):
+        await self.session.close()
+
+
+client = QuoteClient(QUOTES_URL)
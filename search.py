@@ -0,0 +1,17 @@
+"""Text normalization and n-grams shared by the catalog's search index."""
+
+import unicodedata
+
+
+GRAM = 3
+
+
+def normalize(text):
+    """Casefold text and strip its accents."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def grams(text, size=GRAM):
+    """Return the distinct n-grams of text."""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
@@ -0,0 +1,145 @@
+import secrets
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionInterface
+
+
+def init_session(app):
+    """
+    Install the session backend named by app.config["SESSION_BACKEND"].
+
+    "filesystem" uses Flask-Session as before, "sqlite" stores the session
+    server-side in a WAL-mode SQLite file and "cookie" keeps it in Flask's
+    signed cookie, which needs a SECRET_KEY shared by all workers.
+    """
+    backend = app.config.get("SESSION_BACKEND", "filesystem")
+    if backend == "cookie":
+        if not app.secret_key:
+            # Con una clave aleatoria por proceso cada worker rechazaria las cookies firmadas por los demas
+            raise RuntimeError('SESSION_BACKEND="cookie" needs SECRET_KEY, the same in every worker')
+        app.session_interface = SecureCookieSessionInterface()
+    elif backend == "sqlite":
+        app.session_interface = SqliteSessionInterface(
+            app.config.get("SESSION_DATABASE", "sessions.db"),
+            app.config.get("SESSION_IDLE_TIMEOUT", timedelta(hours=12)),
+        )
+    elif backend == "filesystem":
+        from flask_session import Session
+        Session(app)
+    else:
+        raise ValueError(f"unknown SESSION_BACKEND: {backend!r}")
+
+
+class SqliteSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None, refreshed=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.refreshed = refreshed
+
+
+class SqliteSessionInterface(SessionInterface):
+    """
+    Server-side sessions in a SQLite database in WAL mode.
+
+    The cookie only carries a random session id, reissued on every write. A
+    session expires `idle_timeout` after its last request (or
+    PERMANENT_SESSION_LIFETIME if permanent): reading it pushes the expiry
+    back, at most once every `refresh_interval` seconds so most requests
+    stay read-only. Expired rows are swept at most once every
+    `sweep_interval` seconds.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, path, idle_timeout=timedelta(hours=12), sweep_interval=60, refresh_interval=60):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.refresh_interval = refresh_interval
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._swept_at = 0.0
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            connection = self._connect()
+            now = time.time()
+            row = connection.execute(
+                "SELECT data, expires FROM sessions WHERE id = ? AND expires > ?", (sid, now)).fetchone()
+            if row:
+                data = self.serializer.loads(row[0])
+                expires = now + self.lifetime(app, data.get("_permanent", False)).total_seconds()
+                refreshed = expires - row[1] > self.refresh_interval
+                if refreshed:
+                    with connection:
+                        connection.execute("UPDATE sessions SET expires = ? WHERE id = ?", (expires, sid))
+                return SqliteSession(data, sid, refreshed)
+        return SqliteSession()
+
+    def lifetime(self, app, permanent):
+        return app.permanent_session_lifetime if permanent else self.idle_timeout
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        connection = self._connect()
+
+        if not session:
+            if session.modified and session.sid:
+                with connection:
+                    connection.execute("DELETE FROM sessions WHERE id = ?", (session.sid,))
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.accessed:
+            response.vary.add("Cookie")
+        if not session.modified:
+            if session.refreshed and session.permanent:
+                # La fila ya se renovo en open_session; la cookie permanente tambien debe durar mas
+                self._set_cookie(app, session, response, session.sid)
+            return
+
+        # Cada escritura recibe un id nuevo, asi el id previo al login no sirve despues (evita fijacion de sesion)
+        sid = secrets.token_urlsafe(32)
+        lifetime = self.lifetime(app, session.permanent)
+        now = time.time()
+        with connection:
+            if session.sid:
+                connection.execute("DELETE FROM sessions WHERE id = ?", (session.sid,))
+            connection.execute(
+                "INSERT OR REPLACE INTO sessions (id, data, expires) VALUES (?, ?, ?)",
+                (sid, self.serializer.dumps(dict(session)), now + lifetime.total_seconds()))
+            if now - self._swept_at > self.sweep_interval:
+                self._swept_at = now
+                connection.execute("DELETE FROM sessions WHERE expires <= ?", (now,))
+        self._set_cookie(app, session, response, sid)
+
+    def _set_cookie(self, app, session, response, sid):
+        response.set_cookie(
+            self.get_cookie_name(app), sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
@@ -0,0 +1,276 @@
+"""
+Read-only catalog snapshot, memory-mapped and shared by pre-forked workers.
+
+    python snapshot.py [path/to/finance.db] [path/to/catalog.snap]
+
+A snapshot is one file holding the games table as fixed-width columns of
+32-bit integers in catalog order. Text columns hold indexes into a table of
+distinct UTF-8 strings, and the normalized names are kept once more, joined
+by NUL bytes, for substring search. Every worker maps the same file, so the
+catalog sits once in the page cache instead of once per process.
+Replacing the file with os.replace() is atomic: workers keep reading the old
+mapping until they notice the new file.
+"""
+
+import array
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+
+from batch import TierArrays, load_numpy
+from catalog import Category, Game, GameRepository
+from database import Database
+
+
+MAGIC = b"GAMESNAP"
+FORMAT = 1
+# magic, formato, juegos, cadenas, bytes de cadenas, bytes de nombres, version de jerarquia, version del catalogo, updated_at
+HEADER = struct.Struct("<8sIIIIIIQQ")
+INT_COLUMNS = ("id", "cpu_tier", "gpu_tier", "ram")
+STRING_COLUMNS = ("name", "category", "cpu", "gpu", "image", "cpu_key", "gpu_key")
+SEPARATOR = b"\0"
+
+
+def write_snapshot(path, rows, version, hierarchy_version, updated_at):
+    """Write rows (dicts with the games columns, in id order) to path, replacing it atomically."""
+    strings = {}
+    columns = {name: array.array("i") for name in INT_COLUMNS + STRING_COLUMNS}
+    keys = []
+    for row in rows:
+        for name in INT_COLUMNS:
+            columns[name].append(row[name])
+        for name in STRING_COLUMNS:
+            columns[name].append(strings.setdefault(row[name], len(strings)))
+        keys.append(row["name_key"].encode())
+
+    encoded = [string.encode() for string in strings]
+    string_offsets = array.array("i", [0])
+    for string in encoded:
+        string_offsets.append(string_offsets[-1] + len(string))
+    key_offsets = array.array("i", [0])
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key) + len(SEPARATOR))
+    key_blob = b"".join(key + SEPARATOR for key in keys)
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT, len(keys), len(encoded), string_offsets[-1], len(key_blob),
+                            hierarchy_version, version, updated_at))
+        for name in INT_COLUMNS + STRING_COLUMNS:
+            columns[name].tofile(f)
+        string_offsets.tofile(f)
+        key_offsets.tofile(f)
+        f.write(b"".join(encoded))
+        f.write(key_blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def build_snapshot(db, path):
+    """Snapshot the games table of db (a Database) to path."""
+    with db.transaction("DEFERRED"):        # filas y version de la misma instantanea de lectura; no toma el lock de escritura
+        meta = db.execute("SELECT version, hierarchy_version, updated_at FROM catalog_meta")[0]
+        rows = db.execute(
+            "SELECT id, name, name_key, category, cpu, gpu, ram, image, cpu_key, cpu_tier, gpu_key, gpu_tier "
+            "FROM games ORDER BY id")
+    write_snapshot(path, rows, meta["version"], meta["hierarchy_version"], meta["updated_at"])
+
+
+class CatalogSnapshot:
+    """
+    A snapshot file mapped read-only.
+
+    Columns are memoryviews straight over the mapping. Games are
+    materialized only for the positions a caller asks for.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+
+        magic, version, count, strings, strings_size, keys_size, hierarchy_version, catalog_version, updated_at = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT or sys.byteorder != "little":
+            raise ValueError(f"{path} is not a catalog snapshot this build can read")
+        self.version = (catalog_version, hierarchy_version)
+        self.updated_at = updated_at
+
+        view = memoryview(self._map)
+        offset = HEADER.size
+        self.columns = {}
+        for name in INT_COLUMNS + STRING_COLUMNS:
+            self.columns[name] = view[offset:offset + 4 * count].cast("i")
+            offset += 4 * count
+        self._string_offsets = view[offset:offset + 4 * (strings + 1)].cast("i")
+        offset += 4 * (strings + 1)
+        self._key_offsets = view[offset:offset + 4 * (count + 1)].cast("i")
+        offset += 4 * (count + 1)
+        self._strings_at = offset
+        self._keys_at = offset + strings_size
+        self._keys_end = self._keys_at + keys_size
+        self._codes = {}
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def string(self, index):
+        start = self._strings_at + self._string_offsets[index]
+        return self._map[start:self._strings_at + self._string_offsets[index + 1]].decode()
+
+    def game(self, position):
+        column = self.columns
+        intern = sys.intern
+        return Game(
+            column["id"][position], self.string(column["name"][position]),
+            Category(self.string(column["category"][position])),
+            intern(self.string(column["cpu"][position])), intern(self.string(column["gpu"][position])),
+            column["ram"][position], self.string(column["image"][position]),
+            intern(self.string(column["cpu_key"][position])), column["cpu_tier"][position],
+            intern(self.string(column["gpu_key"][position])), column["gpu_tier"][position])
+
+    def games(self, positions):
+        return [self.game(position) for position in positions]
+
+    def after(self, game_id):
+        """Position of the first game with an id greater than game_id."""
+        return bisect_right(self.columns["id"], game_id)
+
+    def position(self, game_id):
+        return bisect_left(self.columns["id"], game_id)
+
+    def codes(self, column):
+        """{key: string index} for the distinct values of the cpu_key or gpu_key column."""
+        codes = self._codes.get(column)
+        if codes is None:
+            codes = self._codes[column] = {self.string(index): index for index in set(self.columns[column])}
+        return codes
+
+    def tier_arrays(self):
+        """TierArrays whose columns are NumPy views of the mapping (needs NumPy)."""
+        if self._arrays is None:
+            np = load_numpy()
+            column = lambda name: np.frombuffer(self.columns[name], dtype=np.int32)
+            self._arrays = TierArrays.from_arrays(
+                column("id"), column("cpu_tier"), column("gpu_tier"), column("cpu_key"), column("gpu_key"),
+                column("ram"), self.codes("cpu_key"), self.codes("gpu_key"))
+        return self._arrays
+
+    def compatible(self, cpu_key, cpu_tier, gpu_key, gpu_tier, ram):
+        """Positions of the games that run on a resolved rig, with GameRepository.compatible's rule."""
+        if load_numpy() is not None:
+            mask = next(self.tier_arrays().masks([(cpu_key, cpu_tier, gpu_key, gpu_tier, ram)]))
+            return mask.nonzero()[0]
+
+        cpu_code = self.codes("cpu_key").get(cpu_key, -1)
+        gpu_code = self.codes("gpu_key").get(gpu_key, -1)
+        column = self.columns
+        rows = zip(column["cpu_tier"], column["cpu_key"], column["gpu_tier"], column["gpu_key"], column["ram"])
+        return array.array("i", (
+            position for position, (game_cpu_tier, game_cpu, game_gpu_tier, game_gpu, game_ram) in enumerate(rows)
+            if (game_cpu_tier < cpu_tier or game_cpu == cpu_code)
+            and (game_gpu_tier < gpu_tier or game_gpu == gpu_code)
+            and game_ram <= ram))
+
+    def search(self, query):
+        """Positions of the games whose normalized name contains query, found with mmap.find over the names."""
+        needle = query.encode()
+        if not needle:
+            return range(len(self))
+        if SEPARATOR in needle:
+            return array.array("i")
+
+        positions = array.array("i")
+        start = self._keys_at
+        while True:
+            found = self._map.find(needle, start, self._keys_end)
+            if found < 0:
+                return positions
+            position = bisect_right(self._key_offsets, found - self._keys_at) - 1
+            positions.append(position)
+            start = self._keys_at + self._key_offsets[position + 1]      # un acierto por juego: se salta al siguiente nombre
+
+
+class SnapshotRepository(GameRepository):
+    """
+    GameRepository that answers from a mapped CatalogSnapshot instead of SQL.
+
+    The games table stays the source of truth. When its version moves past
+    the snapshot's, the first worker to notice rewrites the file, and the
+    others pick the new file up on their next check without a restart. The
+    caches keep positions into the snapshot rather than Game records, and
+    fuzzy search still runs on the n-gram index in SQL.
+    """
+
+    def __init__(self, db, path, **kwargs):
+        super().__init__(db, **kwargs)
+        self.path = path
+        self.snapshot = None
+
+    def iter_all(self, batch=500):
+        self._check_version()
+        snapshot = self.snapshot
+        for start in range(0, len(snapshot), batch):
+            yield from snapshot.games(range(start, min(start + batch, len(snapshot))))
+
+    def _cached(self, cache, key, load):
+        snapshot, positions = super()._cached(cache, key, lambda: (self.snapshot, load()))
+        return snapshot.games(positions)
+
+    def _check_version(self):
+        checked_at = self._checked_at
+        super()._check_version()
+        if self._checked_at != checked_at or self.snapshot is None:
+            self._open()
+
+    def _open(self):
+        """Map the snapshot file if it changed, rebuilding it first when it is missing or stale."""
+        try:
+            stat = os.stat(self.path)
+            identity = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            identity = None
+        if self.snapshot is not None and self.snapshot.identity == identity and self.snapshot.version == self._version:
+            return
+
+        snapshot = CatalogSnapshot(self.path) if identity else None
+        if snapshot is None or snapshot.version != self._version:
+            build_snapshot(self.db, self.path)
+            snapshot = CatalogSnapshot(self.path)
+        self.snapshot = snapshot
+        self.query_cache.clear()
+        self.compat_cache.clear()
+        self._arrays = None
+        self._advisor = None
+
+    def _load_all(self):
+        return range(len(self.snapshot))
+
+    def _load_page(self, after, limit):
+        start = self.snapshot.after(after)
+        return range(start, min(start + limit, len(self.snapshot)))
+
+    def _load_compatible(self, cpu_key, cpu_tier, gpu_key, gpu_tier, ram):
+        return self.snapshot.compatible(cpu_key, cpu_tier, gpu_key, gpu_tier, ram)
+
+    def _load_matches(self, query):
+        return self.snapshot.search(query)
+
+    def _load_fuzzy(self, query, limit):
+        return array.array("i", (self.snapshot.position(game.id) for game in super()._load_fuzzy(query, limit)))
+
+    def _tier_arrays(self):
+        return self.snapshot.tier_arrays()
+
+    def _positions(self):
+        return {game_id: position for position, game_id in enumerate(self.snapshot.columns["id"])}
+
+
+if __name__ == "__main__":
+    build_snapshot(Database(sys.argv[1] if len(sys.argv) > 1 else "finance.db"),
+                   sys.argv[2] if len(sys.argv) > 2 else "catalog.snap")
@@ -0,0 +1,43 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Path of a private copy of finance.db; the committed file is never opened."""
+    shutil.copy(os.path.join(ROOT, "finance.db"), tmp_path)
+    return str(tmp_path / "finance.db")
+
+
+@pytest.fixture
+def make_app(database, tmp_path):
+    """create_app() over the private database, with config on top of the test defaults."""
+    from app import create_app
+
+    def make(**config):
+        return create_app({"DATABASE": database, "SESSION_BACKEND": "cookie", "SECRET_KEY": "test", "AUTH_WORKERS": 0,
+                           "ACTIVITY_LOG": "off", "PROFILE_DIR": str(tmp_path / "profiles"), **config})
+    return make
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def logged_in(client):
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    return client
@@ -0,0 +1,75 @@
+import gc
+import sqlite3
+
+import activity
+from activity import ActivityLog
+from database import Database
+
+
+def test_logs_are_tracked_weakly(database):
+    db = Database(database)
+    log = ActivityLog(db, mode="off")
+    assert log in activity._logs
+    count = len(activity._logs)
+    del log
+    gc.collect()
+    assert len(activity._logs) == count - 1
+    db.close()
+
+
+def test_buffered_events_are_written_on_close(database):
+    db = Database(database)
+    log = ActivityLog(db, mode="buffered", batch_size=4, interval=0.05)
+    for i in range(10):
+        log.log(7, "search", query=f"halo {i}")
+    log.close()
+    assert (log.written, log.dropped) == (10, 0)
+    events, cursor = log.recent(7, limit=20)
+    assert [event["detail"]["query"] for event in events] == [f"halo {i}" for i in reversed(range(10))]
+    assert cursor is None
+    db.close()
+
+
+def test_batch_larger_than_sqlite_variable_limit(database):
+    db = Database(database)
+    log = ActivityLog(db, mode="buffered", batch_size=1000, interval=60)
+    with log.writer().connection() as connection:
+        connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 40)      # 10 filas por INSERT
+    for i in range(1000):
+        log.log(7, "search", query=str(i))
+    log.close()
+    assert (log.written, log.dropped) == (1000, 0)
+    assert db.execute("SELECT COUNT(*) AS n FROM activity WHERE user_id = 7")[0]["n"] == 1000
+    db.close()
+
+
+def test_failed_batch_is_counted_as_dropped(database, monkeypatch):
+    db = Database(database)
+    log = ActivityLog(db, mode="sync")
+
+    def broken():
+        raise OSError("disk full")
+    monkeypatch.setattr(log, "writer", broken)
+    log.log(7, "search", query="halo")
+    assert (log.written, log.dropped) == (0, 1)
+    db.close()
+
+
+def test_api_activity_pages(app, logged_in):
+    app.config.update(ACTIVITY_LOG="sync", ACTIVITY_MAX_PAGE_SIZE=3)
+    for ram in range(1, 8):
+        logged_in.post("/history", data={"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": ram})
+
+    rams, before = [], None
+    while True:
+        page = logged_in.get("/api/activity", query_string={"limit": 100, **({"before": before} if before else {})}).json
+        assert len(page["events"]) <= 3
+        rams += [event["detail"]["ram"] for event in page["events"]]
+        before = page["next"]
+        if before is None:
+            break
+    assert rams == [str(ram) for ram in reversed(range(1, 8))]
+
+
+def test_api_activity_requires_login(client):
+    assert client.get("/api/activity").status_code == 401
@@ -0,0 +1,199 @@
+"""
+UpgradeAdvisor against a brute-force scan of the catalog in finance.db.
+
+The reference counts the games a rig runs by testing every game with
+GameRepository.compatible's rule, and tries every part of the hierarchies
+(not just the steps the advisor keeps) as an upgrade.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from advisor import UpgradeAdvisor
+from catalog import GameRepository
+from database import Database
+from hardware import CPU_ALIASES, GPU_ALIASES, cpu_ranking, gpu_ranking
+
+CPUS = [*cpu_ranking.hierarchy, *CPU_ALIASES, "Unknown CPU"]
+GPUS = [*gpu_ranking.hierarchy, *GPU_ALIASES, "Unknown GPU"]
+RAMS = [0, 3, 8, 33]
+
+
+@pytest.fixture(scope="module")
+def games(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("advisor")
+    shutil.copy(os.path.join(os.path.dirname(__file__), "..", "finance.db"), directory)
+    db = Database(str(directory / "finance.db"))
+    games = GameRepository(db).all()
+    db.close()
+    return games
+
+
+@pytest.fixture(scope="module")
+def advisor(games):
+    return UpgradeAdvisor(games)
+
+
+class Scan:
+    """Compatible games of a rig as a bitmask over the catalog, one full scan per part."""
+
+    def __init__(self, games):
+        self.games = games
+        self._masks = {}
+
+    def mask(self, kind, *part):
+        if (kind, *part) not in self._masks:
+            if kind == "cpu":
+                test = lambda game: game.cpu_tier < part[1] or game.cpu_key == part[0]
+            elif kind == "gpu":
+                test = lambda game: game.gpu_tier < part[1] or game.gpu_key == part[0]
+            else:
+                test = lambda game: game.ram <= part[0]
+            self._masks[kind, *part] = sum(1 << i for i, game in enumerate(self.games) if test(game))
+        return self._masks[kind, *part]
+
+    def count(self, cpu_key, cpu_tier, gpu_key, gpu_tier, ram):
+        return (self.mask("cpu", cpu_key, cpu_tier) & self.mask("gpu", gpu_key, gpu_tier) & self.mask("ram", ram)).bit_count()
+
+
+@pytest.fixture(scope="module")
+def scan(games):
+    return Scan(games)
+
+
+def brute_advise(scan, advisor, cpu, gpu, ram, unlock):
+    cpu_key, cpu_tier = cpu_ranking.resolve(cpu)
+    gpu_key, gpu_tier = gpu_ranking.resolve(gpu)
+    current = scan.count(cpu_key, cpu_tier, gpu_key, gpu_tier, ram)
+
+    def frontier(options):
+        best, steps = current, []
+        for tier, name, runs in options:
+            if runs > best:
+                steps.append({"name": name, "tier": tier, "unlocks": runs - current})
+                best = runs
+        return steps
+
+    advice = {
+        "current": current,
+        "total": len(scan.games),
+        "cpu": frontier((tier, name, scan.count(key, tier, gpu_key, gpu_tier, ram))
+                        for tier, key, name in advisor.cpu_parts if tier >= cpu_tier and key != cpu_key),
+        "gpu": frontier((tier, name, scan.count(cpu_key, cpu_tier, key, tier, ram))
+                        for tier, key, name in advisor.gpu_parts if tier >= gpu_tier and key != gpu_key),
+        "ram": frontier((step, step, scan.count(cpu_key, cpu_tier, gpu_key, gpu_tier, step))
+                        for step in sorted({game.ram for game in scan.games}) if step > ram),
+    }
+    options = [{"part": part, **advice[part][-1]} for part in ("cpu", "gpu", "ram") if advice[part]]
+    advice["best"] = max(options, key=lambda option: option["unlocks"], default=None)
+    advice["cheapest"] = {part: next((step for step in advice[part] if step["unlocks"] >= unlock), None)
+                          for part in ("cpu", "gpu", "ram")}
+    return advice
+
+
+def brute_part(parts, required_key, required_tier):
+    """The first part of a hierarchy, cheapest first, that satisfies a requirement."""
+    for tier, key, name in parts:
+        if key == required_key or tier > required_tier:
+            return {"name": name, "tier": tier}
+    return {"name": None, "tier": None}
+
+
+def test_parts_cover_hierarchies(advisor):
+    assert {key for _, key, _ in advisor.cpu_parts} == {cpu_ranking.key(name) for name in cpu_ranking.hierarchy}
+    assert {key for _, key, _ in advisor.gpu_parts} == {gpu_ranking.key(name) for name in gpu_ranking.hierarchy}
+
+
+def test_count_matches_scan(advisor, scan):
+    for cpu in CPUS:
+        for gpu in GPUS:
+            rig = (*cpu_ranking.resolve(cpu), *gpu_ranking.resolve(gpu))
+            for ram in RAMS:
+                assert advisor.count(*rig, ram) == scan.count(*rig, ram), (cpu, gpu, ram)
+
+
+@pytest.mark.parametrize("ram", RAMS)
+def test_advise_matches_scan(advisor, scan, ram):
+    for cpu in CPUS:
+        for gpu in GPUS:
+            assert advisor.advise(cpu, gpu, ram, unlock=5) == brute_advise(scan, advisor, cpu, gpu, ram, 5), (cpu, gpu, ram)
+
+
+def test_needs_matches_scan(advisor, games):
+    cpu_needs = {}
+    for cpu in CPUS:
+        key, tier = cpu_ranking.resolve(cpu)
+        cpu_needs[cpu] = [None if game.cpu_tier < tier or game.cpu_key == key
+                          else brute_part(advisor.cpu_parts, game.cpu_key, game.cpu_tier) for game in games]
+    gpu_needs = {}
+    for gpu in GPUS:
+        key, tier = gpu_ranking.resolve(gpu)
+        gpu_needs[gpu] = [None if game.gpu_tier < tier or game.gpu_key == key
+                          else brute_part(advisor.gpu_parts, game.gpu_key, game.gpu_tier) for game in games]
+
+    ram = 4
+    for cpu in CPUS:
+        for gpu in GPUS:
+            for i, game in enumerate(games):
+                assert advisor.needs(cpu, gpu, ram, game.id) == {
+                    "game": game.to_json(),
+                    "cpu": cpu_needs[cpu][i],
+                    "gpu": gpu_needs[gpu][i],
+                    "ram": None if game.ram <= ram else {"name": game.ram, "tier": game.ram},
+                }, (cpu, gpu, game.name)
+
+
+def test_needs_unknown_game(advisor):
+    with pytest.raises(KeyError):
+        advisor.needs("Intel Core i5", "NVIDIA GTX 1060", 8, -1)
+
+
+def test_upgrade_page(logged_in, advisor):
+    assert logged_in.get("/upgrade").status_code == 200
+
+    advice = advisor.advise("Intel Core 2 Duo", "NVIDIA GeForce 7600", 2, unlock=3)
+    page = logged_in.post("/upgrade", data={"cpu": "Intel Core 2 Duo", "gpu": "NVIDIA GeForce 7600", "ram": "2",
+                                            "unlock": "3", "game": "creed"})
+    assert page.status_code == 200
+    assert f"Your rig runs {advice['current']} of {advice['total']} games." in page.text
+    assert "To run " in page.text
+
+
+def test_upgrade_page_requires_login(client):
+    assert client.post("/upgrade", data={"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "8"}).status_code == 302
+
+
+def test_upgrade_page_errors(logged_in):
+    rig = {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060"}
+    assert logged_in.post("/upgrade", data={**rig, "ram": "eight"}).status_code == 400
+    assert logged_in.post("/upgrade", data={**rig, "ram": "8", "game": "no such game at all"}).status_code == 404
+
+
+def test_api_upgrade(client, advisor, games):
+    game = games[0]
+    response = client.post("/api/upgrade", json={"cpu": "Pentium 90", "gpu": "OpenGL 1.4", "ram": 1, "unlock": 2, "game": game.id})
+    assert response.status_code == 200
+    expected = advisor.advise("Pentium 90", "OpenGL 1.4", 1, unlock=2)
+    assert {key: response.json[key] for key in expected} == expected
+    assert response.json["needs"] == advisor.needs("Pentium 90", "OpenGL 1.4", 1, game.id)
+
+
+@pytest.mark.parametrize("payload", [None, [], {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060"},
+                                     {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "eight"},
+                                     {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": 8, "unlock": "many"},
+                                     {"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": 8, "game": "creed"},
+                                     *({"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": 8, field: value}
+                                       for field in ("ram", "unlock", "game")
+                                       for value in (8.9, 8.0, True, "8", -1, 2**31, 10**30, float("inf")))])
+def test_api_upgrade_rejects_bad_payload(client, payload):
+    response = client.post("/api/upgrade", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.json
+
+
+def test_api_upgrade_unknown_game(client):
+    response = client.post("/api/upgrade", json={"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": 8, "game": 10**9})
+    assert response.status_code == 404
+    assert "error" in response.json
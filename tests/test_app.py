@@ -0,0 +1,22 @@
+from app import resources
+
+
+def test_create_app_opens_nothing(app):
+    assert not {"db", "catalog", "activity", "hasher"} & set(vars(resources(app)))
+
+
+def test_warm_builds_resources(app):
+    built = resources(app)
+    built.warm()
+    assert {"db", "catalog", "hardware_options", "fragments", "activity"} <= set(vars(built))
+    assert built.catalog.version() is not None
+    assert app.test_client().get("/api/games").status_code == 200        # el pool cerrado por warm() se reabre solo
+
+
+def test_build_is_idempotent(app):
+    built = resources(app)
+    built.build("db")
+    db = built.db
+    built.build("db", "hasher")
+    assert built.db is db
+    assert "hasher" in vars(built)
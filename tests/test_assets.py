@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import io
+import json
+
+import pytest
+from flask import Flask, Response
+
+import assets
+from assets import build_assets, compress_response
+from caching import IMMUTABLE, REVALIDATE
+
+brotli = pytest.importorskip("brotli")
+Image = pytest.importorskip("PIL.Image")
+
+
+def compress(app, body, etag):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = Response(body, mimetype="text/html")
+        response.set_etag(etag)
+        return compress_response(response)
+
+
+def test_same_etag_different_body():
+    app = Flask(__name__)
+    first = "<p>catalog</p>" * 200
+    second = "<p>flash message</p>" + first
+    for body in (first, second, first):
+        response = compress(app, body, "games-1")
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.get_data()).decode() == body
+        assert response.get_etag() == ("games-1", True)
+
+
+def test_small_bodies_are_left_alone():
+    response = compress(Flask(__name__), "<p>hi</p>", "small")
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.fixture
+def static(tmp_path):
+    """A static folder with a stylesheet, a cover and an already compact file, built once."""
+    folder = tmp_path / "static"
+    (folder / "images").mkdir(parents=True)
+    (folder / "styles.css").write_text("body { margin: 0; }\n" * 200)
+    (folder / "tiny.css").write_text("a{}")
+    Image.new("RGB", (600, 800), "teal").save(folder / "images" / "cover.jpg")
+    build_assets(str(folder))
+    return folder
+
+
+@pytest.fixture
+def static_client(make_app, static):
+    app = make_app()
+    app.static_folder = str(static)
+    return app.test_client()
+
+
+def test_webp_for_clients_that_accept_it(static_client, static):
+    manifest = json.loads((static / "manifest.json").read_text())
+    assert manifest["thumbnails"] == {"images/cover.jpg": "thumbs/cover.jpg"}
+
+    response = static_client.get("/static/thumbs/cover.jpg", headers={"Accept": "image/avif,image/webp,*/*"})
+    assert response.mimetype == "image/webp"
+    assert response.get_data() == (static / "thumbs" / "cover.webp").read_bytes()
+    assert "Accept" in response.vary
+
+    for accept in ("*/*", "image/webp;q=0"):
+        response = static_client.get("/static/thumbs/cover.jpg", headers={"Accept": accept})
+        assert response.mimetype == "image/jpeg"
+        assert Image.open(io.BytesIO(response.get_data())).size == (300, 400)
+
+
+@pytest.mark.parametrize("accept, encoding", [("gzip, deflate, br", "br"), ("gzip", "gzip"), ("br;q=0, gzip", "gzip"),
+                                              ("identity", None), ("", None)])
+def test_encoding_follows_accept_encoding(static_client, static, accept, encoding):
+    response = static_client.get("/static/styles.css", headers={"Accept-Encoding": accept})
+    assert response.mimetype == "text/css"
+    assert response.headers.get("Content-Encoding") == encoding
+    assert "Accept-Encoding" in response.vary
+    decompress = {"br": brotli.decompress, "gzip": gzip.decompress, None: lambda data: data}[encoding]
+    assert decompress(response.get_data()) == (static / "styles.css").read_bytes()
+
+
+def test_file_without_variants_is_sent_as_is(static_client):
+    response = static_client.get("/static/tiny.css", headers={"Accept-Encoding": "gzip, br"})
+    assert response.get_data() == b"a{}"
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" not in response.vary
+
+
+def test_hashed_urls_are_immutable(static_client, static):
+    version = hashlib.sha256((static / "styles.css").read_bytes()).hexdigest()[:12]
+    assert static_client.get(f"/static/styles.css?v={version}").headers["Cache-Control"] == IMMUTABLE
+    assert static_client.get("/static/styles.css?v=000000000000").headers["Cache-Control"] == REVALIDATE
+    assert static_client.get("/static/styles.css").headers["Cache-Control"] == REVALIDATE
+
+
+def test_unchanged_files_are_not_rebuilt(static, monkeypatch):
+    outputs = ["styles.css.gz", "styles.css.br", "thumbs/cover.jpg", "thumbs/cover.webp"]
+    built = {output: (static / output).stat().st_mtime_ns for output in outputs}
+
+    def fail(*args):
+        raise AssertionError("rebuilt an unchanged file")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(assets, "_compress", fail)
+        patch.setattr(assets, "_thumbnail", fail)
+        build_assets(str(static))
+    assert {output: (static / output).stat().st_mtime_ns for output in outputs} == built
+
+    # Solo se rehace lo que cambio
+    (static / "styles.css").write_text("p { color: red; }\n" * 200)
+    (static / "styles.css.br").unlink()
+    compressed_files = []
+    monkeypatch.setattr(assets, "_compress", lambda data, encoding, quality: compressed_files.append(encoding) or gzip.compress(data))
+    monkeypatch.setattr(assets, "_thumbnail", fail)
+    manifest = build_assets(str(static))
+    assert sorted(compressed_files) == ["br", "gzip"]
+    assert manifest["files"]["styles.css"]["hash"] == hashlib.sha256((static / "styles.css").read_bytes()).hexdigest()[:12]
@@ -0,0 +1,88 @@
+import os
+import signal
+
+import pytest
+
+from auth import PasswordHasher
+from database import Database, Users
+
+
+@pytest.mark.parametrize("method", ["scrypt", "pbkdf2", "pbkdf2:sha256", "pbkdf2:sha256:1000"])
+def test_fresh_hash_is_not_stale(method):
+    hasher = PasswordHasher(0, method=method)
+    assert not hasher.needs_rehash(hasher.hash("secret"))
+
+
+def test_other_method_is_stale():
+    assert PasswordHasher(0, method="scrypt").needs_rehash(PasswordHasher(0, method="pbkdf2").hash("secret"))
+
+
+def test_broken_pool_is_replaced():
+    hasher = PasswordHasher(1, method="pbkdf2:sha256:1000")
+    pwhash = hasher.hash("secret")
+    for pid in list(hasher._executor._processes):
+        os.kill(pid, signal.SIGKILL)
+    assert hasher.check(pwhash, "secret")
+    assert not hasher.check(pwhash, "wrong")
+
+
+FAST = "pbkdf2:sha256:1000"
+
+
+def register(client, username, password="secret"):
+    response = client.post("/register", data={"username": username, "password": password, "confirmation": password})
+    assert response.status_code == 302
+
+
+def login(client, username, password="secret"):
+    return client.post("/login", data={"username": username, "password": password})
+
+
+def test_login_is_throttled_per_user(make_app):
+    client = make_app(PASSWORD_HASH_METHOD=FAST, LOGIN_RATE_PER_USER=(1 / 3600, 2)).test_client()
+    register(client, "throttled")
+    assert login(client, "throttled", "wrong").status_code == 403
+    assert login(client, "THROTTLED", "wrong").status_code == 403           # el nombre se compara sin mayusculas
+    response = login(client, "throttled")
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= 3600
+    assert login(client, "someone else").status_code == 403                # las demas cuentas siguen con su propio cubo
+
+
+def test_login_is_throttled_per_ip(make_app):
+    client = make_app(PASSWORD_HASH_METHOD=FAST, LOGIN_RATE_PER_IP=(1 / 60, 1)).test_client()
+    assert login(client, "first").status_code == 403
+    response = login(client, "second")
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= 60
+
+
+def test_full_hash_queue_answers_503(make_app):
+    from app import resources
+
+    register(make_app(PASSWORD_HASH_METHOD=FAST).test_client(), "queued")
+    app = make_app(PASSWORD_HASH_METHOD=FAST, AUTH_WORKERS=1, AUTH_QUEUE_SIZE=0)
+    hasher = resources(app).hasher
+    assert hasher._slots.acquire(blocking=False)                           # otro inicio de sesion ocupa el unico lugar
+    try:
+        response = login(app.test_client(), "queued")
+    finally:
+        hasher._slots.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(hasher.retry_after)
+    assert hasher.rejected == 1
+
+
+def test_login_rehashes_after_method_change(make_app, database):
+    register(make_app(PASSWORD_HASH_METHOD=FAST).test_client(), "rehashed")
+    db = Database(database)
+    old = Users(db).by_username("rehashed")["hash"]
+    assert old.startswith(FAST + "$")
+
+    client = make_app(PASSWORD_HASH_METHOD="pbkdf2:sha256:2000").test_client()
+    assert login(client, "rehashed").status_code == 302
+    new = Users(db).by_username("rehashed")["hash"]
+    assert new.startswith("pbkdf2:sha256:2000$")
+    assert login(client, "rehashed").status_code == 302
+    assert Users(db).by_username("rehashed")["hash"] == new       # ya no hace falta volver a hashearla
+    db.close()
@@ -0,0 +1,35 @@
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def template(app):
+    """Path of buy.html; its mtime is put back after the test."""
+    path = os.path.join(app.root_path, app.template_folder, "buy.html")
+    stat = os.stat(path)
+    yield path
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_buy_revalidates_with_etag(client):
+    first = client.get("/buy")
+    assert first.status_code == 200
+    again = client.get("/buy", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_template_change_defeats_if_modified_since(client, template):
+    first = client.get("/buy")
+    since = {"If-Modified-Since": first.headers["Last-Modified"]}
+    assert client.get("/buy", headers=since).status_code == 304
+
+    later = time.time() + 10
+    os.utime(template, (later, later))
+    assert client.get("/buy", headers=since).status_code == 200
+
+
+def test_api_games_if_modified_since(client):
+    first = client.get("/api/games")
+    assert client.get("/api/games", headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
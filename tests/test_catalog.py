@@ -0,0 +1,267 @@
+"""The games table against the dict it was imported from."""
+
+import re
+import sqlite3
+
+import pytest
+from markupsafe import escape
+
+import catalog
+from catalog import GameRepository, create_schema, import_catalog, save_game
+from database import Database
+from hardware import cpu_ranking, gpu_ranking
+from import_games import games as CATALOG
+
+ENTRIES = [(category, game) for category, games_list in CATALOG.items() for game in games_list]
+
+
+def as_dict(game):
+    return {"name": game.name, "cpu": game.cpu, "gpu": game.gpu, "ram": str(game.ram), "image": game.image}
+
+
+@pytest.fixture
+def db(database):
+    db = Database(database)
+    yield db
+    db.close()
+
+
+def check_matches_dict(repository):
+    games = repository.all()
+    assert [(str(game.category), as_dict(game)) for game in games] == ENTRIES
+    for game, (_, entry) in zip(games, ENTRIES):
+        assert (game.cpu_key, game.cpu_tier) == cpu_ranking.resolve(entry["cpu"])
+        assert (game.gpu_key, game.gpu_tier) == gpu_ranking.resolve(entry["gpu"])
+
+
+def test_committed_database_matches_dict(db):
+    check_matches_dict(GameRepository(db))
+
+
+def test_import_catalog(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    import_catalog(path, CATALOG)
+    import_catalog(path, CATALOG)           # reimportar reemplaza, no duplica
+    db = Database(path)
+    check_matches_dict(GameRepository(db))
+    db.close()
+
+
+def test_pages_cover_catalog(db):
+    repository = GameRepository(db)
+    names, after = [], 0
+    while after is not None:
+        page, after = repository.page(after, 17)
+        names += [game.name for game in page]
+    assert names == [game["name"] for _, game in ENTRIES]
+    assert [game.name for game in repository.iter_all(batch=40)] == names
+
+
+def test_changes_are_picked_up_without_restart(db):
+    repository = GameRepository(db, check_interval=0)
+    version = repository.version()
+    before = repository.compatible("Intel Core i9", "NVIDIA RTX 3080", 64)
+    db.execute("DELETE FROM games WHERE name = ?", "Minecraft")
+    assert repository.version() != version
+    after = repository.compatible("Intel Core i9", "NVIDIA RTX 3080", 64)
+    assert [game.name for game in before if game.name != "Minecraft"] == [game.name for game in after]
+
+
+def test_compat_cache_counts_and_evicts(db):
+    repository = GameRepository(db, compat_cache_size=2)
+    repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)
+    repository.compatible("intel core i5 ", "NVIDIA GTX 1060", "9")      # mismo escalon de RAM y la misma CPU normalizada
+    assert repository.compat_cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "maxsize": 2}
+
+    repository.compatible("Intel Core i7", "NVIDIA GTX 1060", 8)
+    repository.compatible("Intel Core i9", "NVIDIA GTX 1060", 8)
+    assert repository.compat_cache.stats() == {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+    repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)            # el menos usado salio de la cache
+    assert repository.compat_cache.stats()["misses"] == 4
+
+    uncached = GameRepository(db, compat_cache_size=0)
+    uncached.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)
+    assert uncached.compat_cache.stats()["size"] == 0
+
+
+def test_caches_follow_catalog_version(db):
+    repository = GameRepository(db, check_interval=0)
+    repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)
+    repository.search("creed")
+    assert len(repository.compat_cache) == 1 and len(repository.query_cache) == 1
+
+    db.execute("UPDATE games SET ram = 64 WHERE name = ?", "Minecraft")
+    repository.version()
+    assert len(repository.compat_cache) == 0 and len(repository.query_cache) == 0
+    assert "Minecraft" not in [game.name for game in repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)]
+
+
+def test_load_racing_a_version_change_is_not_served(db, monkeypatch):
+    repository = GameRepository(db, check_interval=0)
+    search = repository._search
+
+    def racing(*args):
+        # Otro hilo borra un juego y ve la version nueva mientras esta busqueda aun lee la vieja
+        games = search(*args)
+        db.execute("DELETE FROM games WHERE name = ?", "Minecraft")
+        repository.version()
+        return games
+
+    monkeypatch.setattr(repository, "_search", racing)
+    assert "Minecraft" in [game.name for game in repository.search("minecraft")]
+    monkeypatch.setattr(repository, "_search", search)
+    assert repository.search("minecraft") == []
+
+
+def test_caches_follow_hierarchy_version(db, monkeypatch):
+    repository = GameRepository(db, check_interval=0)
+    expected = [game.name for game in repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)]
+    with db.transaction():                          # un tier viejo, como si las tablas de hardware.py hubieran cambiado
+        db.execute("UPDATE catalog_meta SET writing = 1")
+        db.execute("UPDATE games SET cpu_tier = 99 WHERE name = ?", "Minecraft")
+        db.execute("UPDATE catalog_meta SET writing = 0")
+    version = repository.version()
+
+    monkeypatch.setattr(catalog, "HIERARCHY_VERSION", catalog.HIERARCHY_VERSION + 1)
+    catalog_version, hierarchy_version = repository.version()
+    assert catalog_version > version[0] and hierarchy_version == catalog.HIERARCHY_VERSION
+    assert len(repository.compat_cache) == 0
+    assert db.execute("SELECT cpu_tier FROM games WHERE name = ?", "Minecraft")[0]["cpu_tier"] == cpu_ranking.rank("AMD Athlon II")
+    assert [game.name for game in repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)] == expected
+
+
+def test_compat_warmup(make_app):
+    from app import resources
+
+    app = make_app(COMPAT_WARMUP=[("Intel Core i5", "NVIDIA GTX 1060", 8), ("Pentium 90", "OpenGL 1.4", 1)])
+    repository = resources(app).catalog
+    assert repository.compat_cache.stats()["size"] == 2
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    client.post("/history", data={"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "8"})
+    assert repository.compat_cache.stats()["hits"] == 1
+    assert repository.compat_cache.stats()["misses"] == 2
+
+
+def test_saved_game_is_indexed(database, db):
+    repository = GameRepository(db, check_interval=0)
+    game = {"name": "Ñandú Racer", "cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": "8", "image": "nandu.jpg"}
+    game_id = save_game(database, "Medio", game)
+    assert [found.id for found in repository.search("nandu rac")] == [game_id]
+    assert game_id in [found.id for found in repository.compatible("Intel Core i5", "NVIDIA GTX 1060", 8)]
+
+    # Renombrarlo y bajarle los requisitos rehace sus n-gramas y sus tiers
+    save_game(database, "Bajo", {**game, "name": "Emu Racer", "cpu": "Pentium 90", "gpu": "OpenGL 1.4", "ram": "1"}, game_id)
+    assert repository.search("nandu") == []
+    assert [found.id for found in repository.search("emu racer")] == [game_id]
+    assert game_id in [found.id for found in repository.compatible("Pentium 90", "OpenGL 1.4", 1)]
+    assert db.execute("SELECT COUNT(*) AS n FROM gram_stats WHERE df != "
+                      "(SELECT COUNT(*) FROM game_grams WHERE game_grams.gram = gram_stats.gram)")[0]["n"] == 0
+
+    with pytest.raises(KeyError):
+        save_game(database, "Bajo", game, 10**9)
+
+
+def test_unknown_category_is_rejected(database, db):
+    game = {"name": "Indie Racer", "cpu": "Pentium 90", "gpu": "OpenGL 1.4", "ram": "1", "image": "indie.jpg"}
+    with pytest.raises(ValueError):
+        save_game(database, "Indie", game)
+    connection = sqlite3.connect(database)
+    with pytest.raises(sqlite3.IntegrityError, match="CHECK"):
+        connection.execute("UPDATE games SET category = 'Indie' WHERE name = 'Minecraft'")
+    connection.close()
+    assert len(GameRepository(db).all()) == len(ENTRIES)
+
+
+def test_old_games_table_gets_category_check(tmp_path):
+    path = str(tmp_path / "old.db")
+    import_catalog(path, CATALOG)
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE games_old AS SELECT * FROM games;
+        DROP TABLE games;
+        ALTER TABLE games_old RENAME TO games;
+    """)                                             # la tabla sin el CHECK, como la dejaba un SCHEMA anterior
+    create_schema(connection)
+    with pytest.raises(sqlite3.IntegrityError, match="CHECK"):
+        connection.execute("UPDATE games SET category = 'Indie' WHERE name = 'Minecraft'")
+    connection.close()
+    db = Database(path)
+    check_matches_dict(GameRepository(db))
+    db.close()
+
+
+def test_raw_writes_are_rejected(database):
+    connection = sqlite3.connect(database)
+    with pytest.raises(sqlite3.IntegrityError, match="save_game"):
+        connection.execute("INSERT INTO games (name, name_key, category, cpu, cpu_key, cpu_tier, gpu, gpu_key, gpu_tier, ram, image, gram_count) "
+                           "VALUES ('X', 'x', 'Bajo', 'Pentium 90', 'pentium 90', 1, 'OpenGL 1.4', 'opengl 1.4', 1, 1, 'x.jpg', 0)")
+    with pytest.raises(sqlite3.IntegrityError, match="save_game"):
+        connection.execute("UPDATE games SET cpu = 'Intel Core i9' WHERE name = 'Minecraft'")
+    assert connection.execute("UPDATE games SET ram = ram + 1 WHERE name = 'Minecraft'").rowcount == 1     # nada derivado de ram
+    connection.rollback()
+    connection.close()
+
+
+def test_api_games(client):
+    response = client.get("/api/games?limit=500")
+    assert [game["name"] for game in response.json["games"]] == [game["name"] for _, game in ENTRIES]
+
+
+def listing_rows(page):
+    return re.findall(r"<li>[^<]*GB RAM</li>", page)
+
+
+def expected_rows(games):
+    return [f"<li>{escape(game.name)} - {escape(game.cpu)}, {escape(game.gpu)}, {game.ram}GB RAM</li>" for game in games]
+
+
+@pytest.mark.parametrize("limit", [1, 17, 50, 182, 183, 500])
+def test_api_games_cursors_cover_catalog(client, db, limit):
+    games, after, pages = [], 0, 0
+    while after is not None:
+        response = client.get(f"/api/games?after={after}&limit={limit}")
+        assert response.status_code == 200
+        assert 0 < len(response.json["games"]) <= limit
+        games += response.json["games"]
+        after = response.json["next"]
+        pages += 1
+    assert games == [game.to_json() for game in GameRepository(db).all()]
+    assert pages == -(-len(games) // min(limit, 500))
+
+
+@pytest.mark.parametrize("limit", [1, 17, 50, 500])
+def test_buy_pages_cover_catalog(client, db, limit):
+    rows, url = [], f"/buy?limit={limit}"
+    while url:
+        page = client.get(url).text
+        rows += listing_rows(page)
+        match = re.search(r'<a href="([^"]+)">Next page</a>', page)
+        url = match and match.group(1).replace("&amp;", "&")
+        if url:
+            url += f"&limit={limit}"
+    assert rows == expected_rows(GameRepository(db).all())
+
+
+@pytest.mark.parametrize("query, count", [("after=abc", 50), ("after=-5", 50), ("after=", 50),
+                                          ("limit=0", 1), ("limit=-1", 1), ("limit=abc", 50), ("limit=100000", 183)])
+def test_bad_cursor_falls_back(client, db, query, count):
+    response = client.get(f"/api/games?{query}")
+    assert response.status_code == 200
+    assert [game["id"] for game in response.json["games"]] == [game.id for game in GameRepository(db).all()[:count]]
+
+
+def test_cursor_past_the_end(client, db):
+    last = GameRepository(db).all()[-1].id
+    assert client.get(f"/api/games?after={last}").json == {"games": [], "next": None}
+    assert "No matching games found." in client.get(f"/buy?after={last}").text
+
+
+def test_buy_streams_all(client, db):
+    response = client.get("/buy?all=1")
+    assert response.is_streamed
+    rows = listing_rows(response.get_data(as_text=True))
+    assert len(rows) == 183
+    assert rows == expected_rows(GameRepository(db).all())
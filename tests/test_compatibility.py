@@ -0,0 +1,123 @@
+"""
+/history against the loop it replaced.
+
+The reference is the baseline loop over the catalog dict, with the baseline
+is_higher_cpu/is_higher_gpu comparisons done on the hardware.py rankings.
+Since hardware.py has aliases, "same part" compares canonical keys instead
+of raw strings, so two spellings of one part match; what that changed from
+the original results is pinned in test_hardware.py.
+"""
+
+import pytest
+from markupsafe import escape
+
+from catalog import GameRepository
+from database import Database
+from hardware import CPU_ALIASES, GPU_ALIASES, cpu_ranking, gpu_ranking
+from import_games import games as CATALOG
+from snapshot import SnapshotRepository
+
+CPUS = [*cpu_ranking.hierarchy, *CPU_ALIASES, "Unknown CPU"]
+GPUS = [*gpu_ranking.hierarchy, *GPU_ALIASES, "Unknown GPU"]
+RAMS = [0, 1, 2, 3, 4, 6, 8, 12, 16, 33]
+GAMES = [game for games_list in CATALOG.values() for game in games_list]
+
+
+def same_cpu(user_cpu, game_cpu):
+    return cpu_ranking.key(user_cpu) == cpu_ranking.key(game_cpu)
+
+
+def same_gpu(user_gpu, game_gpu):
+    return gpu_ranking.key(user_gpu) == gpu_ranking.key(game_gpu)
+
+
+def is_higher_cpu(user_cpu, game_cpu):
+    return cpu_ranking.rank(user_cpu) > cpu_ranking.rank(game_cpu)
+
+
+def is_higher_gpu(user_gpu, game_gpu):
+    return gpu_ranking.rank(user_gpu) > gpu_ranking.rank(game_gpu)
+
+
+def baseline(user_cpu, user_gpu, user_ram):
+    compatible_games = []
+    for category, games_list in CATALOG.items():
+        for game in games_list:
+            if (
+                same_cpu(user_cpu, game["cpu"]) or is_higher_cpu(user_cpu, game["cpu"])
+            ) and (
+                same_gpu(user_gpu, game["gpu"]) or is_higher_gpu(user_gpu, game["gpu"])
+            ) and int(user_ram) >= int(game["ram"]):
+                compatible_games.append(game["name"])
+    return compatible_games
+
+
+@pytest.fixture(scope="module")
+def expected():
+    # Cada predicado del bucle depende de una sola parte: se evalua una vez por opcion y juego, no por combinacion
+    cpu_ok = {cpu: {i for i, game in enumerate(GAMES) if same_cpu(cpu, game["cpu"]) or is_higher_cpu(cpu, game["cpu"])}
+              for cpu in CPUS}
+    gpu_ok = {gpu: {i for i, game in enumerate(GAMES) if same_gpu(gpu, game["gpu"]) or is_higher_gpu(gpu, game["gpu"])}
+              for gpu in GPUS}
+    ram_ok = {ram: {i for i, game in enumerate(GAMES) if ram >= int(game["ram"])} for ram in RAMS}
+    return {(cpu, gpu, ram): [GAMES[i]["name"] for i in sorted(cpu_ok[cpu] & gpu_ok[gpu] & ram_ok[ram])]
+            for cpu in CPUS for gpu in GPUS for ram in RAMS}
+
+
+@pytest.fixture(params=["sql", "snapshot"])
+def repository(request, database, tmp_path):
+    db = Database(database)
+    if request.param == "sql":
+        repository = GameRepository(db)
+    else:
+        repository = SnapshotRepository(db, str(tmp_path / "catalog.snapshot"))
+    yield repository
+    db.close()
+
+
+def test_precomputed_predicates_match_loop(expected):
+    for rig in [("Intel Core i5", "NVIDIA GTX 1060", 8), ("Pentium 90", "OpenGL 1.4", 1),
+                ("Intel CoreTM2 Duo", "256 MB de vRAM", 2), ("Unknown CPU", "Unknown GPU", 33)]:
+        assert expected[rig] == baseline(*rig)
+
+
+def test_compatible_matches_loop(repository, expected):
+    for (cpu, gpu, ram), names in expected.items():
+        assert [game.name for game in repository.compatible(cpu, gpu, str(ram))] == names, (cpu, gpu, ram)
+
+
+def test_cached_results_match_loop(repository, expected):
+    rigs = [("Intel Core i7", "NVIDIA RTX 2060", ram) for ram in RAMS] * 2
+    for cpu, gpu, ram in rigs:
+        assert [game.name for game in repository.compatible(cpu, gpu, ram)] == expected[cpu, gpu, ram]
+
+
+def test_compatible_many_matches_loop(repository, expected):
+    rigs = list(expected)
+    names = {game.id: game.name for game in repository.all()}
+    for rig, ids in zip(rigs, repository.compatible_many(rigs)):
+        assert [names[game_id] for game_id in ids] == expected[rig], rig
+
+
+def test_history_route(logged_in, expected):
+    for rig in [("Intel Core i5", "NVIDIA GTX 1060", 8), ("Intel Core 2 Duo", "256 MB of vRAM", 2)]:
+        page = logged_in.post("/history", data=dict(zip(("cpu", "gpu", "ram"), rig))).text
+        assert [game["name"] for game in GAMES if f"<h4>{escape(game['name'])}</h4>" in page] == expected[rig]
+
+
+def test_api_compatibility_matches_loop(client, expected):
+    rigs = [("Intel Core i5", "NVIDIA GTX 1060", 8), ("Pentium 90", "OpenGL 1.4", 1), ("Intel Core i9", "NVIDIA RTX 3080", 2**31 - 1)]
+    games = client.get("/api/games?limit=500").json["games"]
+    names = {game["id"]: game["name"] for game in games}
+    response = client.post("/api/compatibility", json={"rigs": [dict(zip(("cpu", "gpu", "ram"), rig)) for rig in rigs]})
+    assert response.status_code == 200
+    assert [names[game_id] for game_id in response.json["results"][0]] == expected[rigs[0]]
+    assert [names[game_id] for game_id in response.json["results"][1]] == expected[rigs[1]]
+    assert len(response.json["results"][2]) == len(games)
+
+
+@pytest.mark.parametrize("ram", [10**30, 2**31, -1, True, 8.0, "8", None])
+def test_api_compatibility_rejects_bad_ram(client, ram):
+    response = client.post("/api/compatibility", json={"rigs": [{"cpu": "Intel Core i5", "gpu": "NVIDIA GTX 1060", "ram": ram}]})
+    assert response.status_code == 400
+    assert "error" in response.json
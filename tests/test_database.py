@@ -0,0 +1,111 @@
+"""Database against the cs50 SQL behaviour the routes were written for."""
+
+import threading
+
+import pytest
+
+from database import Database, _expand
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, note TEXT)")
+    yield db
+    db.close()
+
+
+def names(db):
+    return [row["name"] for row in db.execute("SELECT name FROM items ORDER BY id")]
+
+
+@pytest.mark.parametrize("sql, args, expected", [
+    ("SELECT ? , ?", [1, 2], ("SELECT ? , ?", [1, 2])),
+    ("WHERE id IN (?)", [[1, 2, 3]], ("WHERE id IN (?, ?, ?)", [1, 2, 3])),
+    ("WHERE id IN (?) AND name = ?", [(4, 5), "a"], ("WHERE id IN (?, ?) AND name = ?", [4, 5, "a"])),
+    ("WHERE id IN (?)", [[]], ("WHERE id IN ()", [])),
+    ("WHERE note = '?' AND id IN (?)", [[1, 2]], ("WHERE note = '?' AND id IN (?, ?)", [1, 2])),
+    ("WHERE note = 'it''s ?' AND name = ?", [[7]], ("WHERE note = 'it''s ?' AND name = ?", [7])),
+    ('SELECT "a?b" FROM t WHERE x = ?', [[8, 9]], ('SELECT "a?b" FROM t WHERE x = ?, ?', [8, 9])),
+])
+def test_expand(sql, args, expected):
+    assert _expand(sql, args) == expected
+
+
+def test_list_argument_leaves_quoted_marks_alone(db):
+    db.execute("INSERT INTO items (name, note) VALUES ('a?', ?)", "x")
+    db.execute("INSERT INTO items (name, note) VALUES (?, ?)", "b", "y")
+    rows = db.execute("SELECT name FROM items WHERE name != '?' AND note IN (?) ORDER BY id", ["x", "y"])
+    assert [row["name"] for row in rows] == ["a?", "b"]
+
+
+def test_return_values(db):
+    assert db.execute("INSERT INTO items (name) VALUES (?)", "a") == 1
+    assert db.execute("  insert INTO items (name) VALUES (?)", "b") == 2      # como cs50, sin importar mayusculas ni espacios
+    assert db.execute("SELECT id, name FROM items WHERE id = ?", 2) == [{"id": 2, "name": "b"}]
+    assert db.execute("SELECT name FROM items WHERE id = ?", 99) == []
+    assert db.execute("UPDATE items SET note = ?", "n") == 2
+    assert db.execute("DELETE FROM items WHERE name = ?", "nobody") == 0
+    assert db.execute("DELETE FROM items WHERE id IN (?)", [1, 2]) == 2
+
+
+def test_constraint_failure_is_value_error(db):
+    db.execute("INSERT INTO items (name) VALUES (?)", "a")
+    with pytest.raises(ValueError):
+        db.execute("INSERT INTO items (name) VALUES (?)", "a")
+    with pytest.raises(ValueError):
+        db.execute("INSERT INTO items (name) VALUES (?)", None)
+    assert names(db) == ["a"]
+
+
+def test_transaction_commits(db):
+    with db.transaction():
+        db.execute("INSERT INTO items (name) VALUES (?)", "a")
+        db.execute("INSERT INTO items (name) VALUES (?)", "b")
+    assert names(db) == ["a", "b"]
+
+
+def test_transaction_rolls_back_on_error(db):
+    with pytest.raises(ValueError):
+        with db.transaction():
+            db.execute("INSERT INTO items (name) VALUES (?)", "a")
+            db.execute("INSERT INTO items (name) VALUES (?)", "a")
+    assert names(db) == []
+
+    # La conexion vuelve al pool sin una transaccion abierta
+    db.execute("INSERT INTO items (name) VALUES (?)", "b")
+    assert names(db) == ["b"]
+
+
+def test_nested_transaction_joins_the_outer_one(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute("INSERT INTO items (name) VALUES (?)", "a")
+            with db.transaction():
+                db.execute("INSERT INTO items (name) VALUES (?)", "b")
+            assert names(db) == ["a", "b"]
+            raise RuntimeError
+    assert names(db) == []
+
+    with db.transaction():
+        with db.transaction():
+            db.execute("INSERT INTO items (name) VALUES (?)", "c")
+        db.execute("INSERT INTO items (name) VALUES (?)", "d")
+    assert names(db) == ["c", "d"]
+
+
+def test_transaction_is_hidden_from_other_threads(db):
+    seen = []
+    with db.transaction():
+        db.execute("INSERT INTO items (name) VALUES (?)", "a")
+        thread = threading.Thread(target=lambda: seen.append(names(db)))       # otra conexion del pool, en WAL no espera
+        thread.start()
+        thread.join()
+    assert seen == [[]]
+    assert names(db) == ["a"]
+
+
+def test_duplicate_register_is_rejected(client):
+    form = {"username": "twice", "password": "secret", "confirmation": "secret"}
+    assert client.post("/register", data=form).status_code == 302
+    assert client.post("/register", data=form).status_code == 400
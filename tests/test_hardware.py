@@ -0,0 +1,96 @@
+"""
+hardware.py rankings, and the /history results the aliases changed.
+
+Before the aliases a part spelled differently from the tables ranked 0, so
+every rig passed it and a game listing only such parts showed up for
+everyone; a rig part spelled that way never matched its own game.
+"""
+
+import html
+import re
+
+import pytest
+
+from hardware import CPU_ALIASES, CPU_HIERARCHY, GPU_ALIASES, GPU_HIERARCHY, Ranking, cpu_ranking, gpu_ranking, normalize
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Intel Core 2 Duo", "intelcore2duo"),
+    ("  Intel   Core 2  Duo ", "intelcore2duo"),
+    ("Intel Core™2 Duo", "intelcore2duo"),
+    ("NVIDIA GeForce GTX 260", "nvidiageforcegtx260"),
+    ("Nvidia Geforce GTX 260", "nvidiageforcegtx260"),
+    ("", ""),
+])
+def test_normalize(name, expected):
+    assert normalize(name) == expected
+
+
+@pytest.mark.parametrize("ranking, spelling, canonical", [
+    (cpu_ranking, "Intel CoreTM2 Duo", "Intel Core 2 Duo"),
+    (cpu_ranking, "Intel 2 Core Duo", "Intel Core 2 Duo"),
+    (cpu_ranking, "Pentium III", "Intel Pentium III"),
+    (cpu_ranking, "AMD Athlon64 X2", "AMD Athlon 64 X2"),
+    (gpu_ranking, "Nvidia Geforce GTX 260", "NVIDIA GeForce GTX 260"),
+    (gpu_ranking, "GeForce 7800 GTX", "NVIDIA GeForce 7800 GTX"),
+    (gpu_ranking, "256 MB de vRAM", "256 MB of vRAM"),
+])
+def test_alias_resolves_to_part(ranking, spelling, canonical):
+    assert ranking.resolve(spelling) == ranking.resolve(canonical)
+    assert ranking.rank(spelling) > 0
+
+
+def test_tables_rank_their_own_entries():
+    for ranking, hierarchy in ((cpu_ranking, CPU_HIERARCHY), (gpu_ranking, GPU_HIERARCHY)):
+        for name, rank in hierarchy.items():
+            assert ranking.rank(name) == rank
+            assert ranking.key(name) == normalize(name)
+
+
+def test_aliases_point_into_tables():
+    assert set(CPU_ALIASES.values()) <= set(CPU_HIERARCHY)
+    assert set(GPU_ALIASES.values()) <= set(GPU_HIERARCHY)
+
+
+def test_unknown_parts_rank_zero():
+    assert cpu_ranking.resolve("Some Future CPU") == ("somefuturecpu", 0)
+    assert cpu_ranking.resolve(None) == (None, 0)
+
+
+def test_lookups_reuse_resolved_entries():
+    ranking = Ranking({"Part A": 1}, {"Part B": "Part A"})
+    assert ranking.resolve("Part A") is ranking.resolve("Part B") is ranking.resolve("part a")
+
+
+def history(client, cpu, gpu, ram):
+    """Names of the games /history lists for the rig, in order."""
+    page = client.post("/history", data={"cpu": cpu, "gpu": gpu, "ram": ram}).text
+    return [html.unescape(name) for name in re.findall(r"<h4>(.*?)</h4>", page)]
+
+
+def test_history_pentium_iii(logged_in):
+    assert history(logged_in, "Intel Pentium III", "64 MB of vRAM", 1) == [
+        "Fable: The Lost Chapters", "Max Payne", "Diablo II", "StarCraft", "Warcraft III",
+        "Command & Conquer: Red Alert 2", "Quake III Arena", "The Elder Scrolls III: Morrowind", "Silent Hill 2",
+        "Thief II: The Metal Age", "Fallout", "Resident Evil 3: Nemesis", "Hotline Miami", "Don't Starve",
+        "Super Meat Boy", "Limbo", "SimCity 4", "Gears of War", "Portal", "Torchlight"]
+
+
+def test_history_alias_changes(logged_in):
+    # "Intel CoreTM2 Duo" es la misma CPU: antes no coincidia con el texto exacto y tenia el mismo rango
+    listed = history(logged_in, "Intel Core 2 Duo", "NVIDIA GeForce 8800GTS", 2)
+    assert "Resident Evil 6" in listed
+    # "Nvidia GeForce 9600 GT" rankeaba 0 y ahora esta por encima de la 8800GTS
+    assert "Minecraft" not in listed
+
+    # "Intel 2 Core Duo" y "AMD Athlon64 X2" rankeaban 0 y ahora estan por encima del Pentium 4
+    listed = history(logged_in, "Intel Pentium 4", "NVIDIA GeForce 8800GTS", 4)
+    assert "Battlefield 4" not in listed
+    assert "Heroes of Might and Magic III" not in listed
+    assert "Call of Duty 2" in listed
+
+    # "GeForce 7800 GTX" rankeaba 0 y ahora esta por encima de una grafica de 256 MB
+    assert "The Witcher: Enhanced Edition Director's Cut" not in history(logged_in, "Intel Pentium 4", "256 MB of vRAM", 2)
+
+    # "Pentium III" rankeaba 0 y ahora esta por encima del Pentium II
+    assert "The Elder Scrolls III: Morrowind" not in history(logged_in, "Pentium II", "NVIDIA RTX 3080", 16)
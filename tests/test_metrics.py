@@ -0,0 +1,31 @@
+import metrics
+
+
+def count(histogram, *labels):
+    series = histogram._series.get(labels)
+    return sum(series[0]) if series else 0
+
+
+def test_enabled_per_app(make_app):
+    app = make_app(METRICS_ENABLED=True)
+    other = make_app(METRICS_ENABLED=False)
+    assert app.extensions["metrics"] is True
+    assert other.extensions["metrics"] is False
+
+    before = count(metrics.request_seconds, "api_games", "GET", 200)
+    phases = count(metrics.phase_seconds, "catalog.page")
+    other.test_client().get("/api/games")
+    assert count(metrics.request_seconds, "api_games", "GET", 200) == before
+    assert count(metrics.phase_seconds, "catalog.page") == phases
+
+    app.test_client().get("/api/games")
+    assert count(metrics.request_seconds, "api_games", "GET", 200) == before + 1
+    assert count(metrics.phase_seconds, "catalog.page") == phases + 1
+
+
+def test_metrics_endpoint(client):
+    client.get("/api/games")
+    body = client.get("/metrics").text
+    assert 'app_request_duration_seconds_count{endpoint="api_games",method="GET",status="200"}' in body
+    assert 'app_cache_misses_total{cache="catalog_query"} 1' in body          # GameRepository.stats(), leido en cada scrape
+    assert 'app_cache_size{cache="catalog_compatible"} 0' in body
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+import pytest
+from a2wsgi import ASGIMiddleware
+from werkzeug.test import Client
+
+from asgi import AsyncApp
+from benchmarks.quote_stub import QuoteStub
+from quotes import AsyncQuoteClient, QuoteClient
+
+
+def test_quote_requires_login(client):
+    response = client.get("/api/quote?symbol=AAPL")
+    assert response.status_code == 401
+    assert response.json == {"error": "login required"}
+
+
+def test_quote_needs_symbol(logged_in):
+    assert logged_in.get("/api/quote").status_code == 400
+
+
+def asgi_get(app, path, cookie=None):
+    # a2wsgi tambien convierte en sentido contrario: el cliente de pruebas de werkzeug habla con la app ASGI por WSGI
+    client = Client(ASGIMiddleware(AsyncApp(app)))
+    if cookie is not None:
+        client.set_cookie(cookie.key, cookie.value)
+    return client.get(path, buffered=True)
+
+
+@pytest.mark.parametrize("path", ["/api/quote?symbol=AAPL", "/api/portfolio"])
+def test_asgi_routes_require_login(app, path):
+    response = asgi_get(app, path)
+    assert response.status_code == 401
+    assert response.json == {"error": "login required"}
+
+
+def test_asgi_quote_needs_symbol(app, logged_in):
+    cookie = logged_in.get_cookie(app.config["SESSION_COOKIE_NAME"])
+    assert asgi_get(app, "/api/quote", cookie).status_code == 400
+
+
+@pytest.fixture(scope="module")
+def quote_server():
+    server = QuoteStub().start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub(quote_server):
+    """The local stand-in for the quote API, with its request counter at zero."""
+    quote_server.requests = 0
+    quote_server.delay = 0
+    return quote_server
+
+
+def test_lookup_parses_and_caches(stub):
+    client = QuoteClient(stub.url, ttl=60)
+    assert client.lookup("aapl") == {"name": "AAPL Inc.", "price": 100.0, "symbol": "AAPL"}
+    assert client.lookup("AAPL") == client.lookup("aapl")
+    assert stub.requests == 1
+
+
+def test_expired_quotes_are_fetched_again(stub):
+    client = QuoteClient(stub.url, ttl=0)
+    client.lookup("AAPL")
+    client.lookup("AAPL")
+    assert stub.requests == 2
+
+
+def test_cache_is_bounded(stub):
+    client = QuoteClient(stub.url, cache_size=2)
+    for symbol in ("A", "B", "C", "C", "B", "A"):
+        client.lookup(symbol)
+    assert stub.requests == 4          # A salio de la cache al entrar C
+    assert len(client._cache) == 2
+
+
+def test_concurrent_lookups_share_one_request(stub):
+    stub.delay = 0.2
+    client = QuoteClient(stub.url)
+    start = threading.Barrier(8)
+    results = []
+
+    def lookup():
+        start.wait()
+        results.append(client.lookup("MSFT"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stub.requests == 1
+    assert results == [results[0]] * 8 and results[0]["symbol"] == "MSFT"
+
+
+def test_lookup_many(stub):
+    client = QuoteClient(stub.url)
+    quotes = client.lookup_many(["aapl", "MSFT", "AAPL", "goog"])
+    assert list(quotes) == ["AAPL", "MSFT", "GOOG"]
+    assert all(quote["symbol"] == symbol for symbol, quote in quotes.items())
+    assert stub.requests == 3
+
+
+def test_timeout_and_errors_give_none(stub):
+    stub.delay = 0.5
+    client = QuoteClient(stub.url, read_timeout=0.1)
+    assert client.lookup("SLOW") is None
+    assert client.lookup("SLOW") is None        # los fallos no se guardan en la cache
+    assert stub.requests == 2
+
+    stub.delay = 0
+    assert QuoteClient(stub.url + "/missing").lookup("AAPL") is None       # 404
+    closed = QuoteStub()
+    closed.server_close()
+    assert QuoteClient(closed.url, connect_timeout=0.5).lookup("AAPL") is None
+
+
+def run_async(stub, test, **options):
+    async def main():
+        client = AsyncQuoteClient(stub.url, **options)
+        try:
+            return await test(client)
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def test_async_lookup_caches(stub):
+    async def test(client):
+        assert await client.lookup("aapl") == {"name": "AAPL Inc.", "price": 100.0, "symbol": "AAPL"}
+        await client.lookup("AAPL")
+    run_async(stub, test)
+    assert stub.requests == 1
+
+
+def test_async_cache_is_bounded(stub):
+    async def test(client):
+        for symbol in ("A", "B", "C", "A"):
+            await client.lookup(symbol)
+        return len(client._cache)
+    assert run_async(stub, test, cache_size=2) == 2
+    assert stub.requests == 4
+
+
+def test_async_concurrent_lookups_share_one_request(stub):
+    stub.delay = 0.2
+
+    async def test(client):
+        return await asyncio.gather(*(client.lookup("MSFT") for _ in range(8)))
+    results = run_async(stub, test)
+    assert stub.requests == 1
+    assert results == [results[0]] * 8 and results[0]["symbol"] == "MSFT"
+
+
+def test_async_lookup_many(stub):
+    async def test(client):
+        return await client.lookup_many(["aapl", "MSFT", "AAPL"])
+    assert list(run_async(stub, test)) == ["AAPL", "MSFT"]
+    assert stub.requests == 2
+
+
+def test_async_timeout_gives_none(stub):
+    stub.delay = 0.5
+
+    async def test(client):
+        return await client.lookup("SLOW")
+    assert run_async(stub, test, read_timeout=0.1) is None
@@ -0,0 +1,79 @@
+"""Catalog search against the regex scan /buy used to run over every name."""
+
+import re
+import sqlite3
+
+import pytest
+from markupsafe import escape
+
+from catalog import GameRepository
+from database import Database
+from import_games import games as CATALOG
+from search import grams, normalize
+
+NAMES = [game["name"] for games_list in CATALOG.values() for game in games_list]
+
+
+def baseline(query):
+    # El bucle original con la consulta escapada: la busqueda nueva trata la consulta como texto, no como regex
+    query = query.strip().lower()
+    return [name for name in NAMES if re.search(re.escape(query), name, re.IGNORECASE)]
+
+
+@pytest.fixture
+def catalog(database):
+    db = Database(database)
+    yield GameRepository(db)
+    db.close()
+
+
+def queries():
+    """Every substring of up to 6 characters of every name, lowercased."""
+    found = set()
+    for name in NAMES:
+        name = name.lower()
+        for size in range(1, 7):
+            found.update(name[i:i + size] for i in range(len(name) - size + 1))
+    return sorted(found)
+
+
+def test_search_matches_regex_scan(catalog):
+    for query in queries():
+        assert [game.name for game in catalog.search(query)] == baseline(query), query
+
+
+@pytest.mark.parametrize("query", ["Far Cry", "  portal ", "ASSASSIN'S", "call of duty: black", "zzz", "witcher 3"])
+def test_search_phrases(catalog, query):
+    assert [game.name for game in catalog.search(query)] == baseline(query)
+
+
+@pytest.mark.parametrize("query", ["far cry.", ".*", "(", "[a-z]+", "3 (2020)"])
+def test_search_is_literal(catalog, query):
+    assert [game.name for game in catalog.search(query)] == baseline(query)
+
+
+def test_search_ignores_accents(catalog):
+    assert [game.name for game in catalog.search("pokémon")] == [game.name for game in catalog.search("pokemon")]
+    assert normalize("Pokémon") == "pokemon"
+
+
+def test_grams():
+    assert grams("halo") == {"hal", "alo"}
+    assert grams("ha") == set()
+
+
+def test_buy_route(logged_in):
+    page = logged_in.post("/buy", data={"query": "Call of Duty"}).text
+    assert all(str(escape(name)) in page for name in baseline("Call of Duty"))
+
+
+def test_search_binds_grams_as_one_variable(database):
+    db = Database(database)
+    catalog = GameRepository(db)
+    with db.connection() as connection:
+        connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 8)      # menos que los n-gramas de la consulta
+    query = "call of duty: black"
+    assert [game.name for game in catalog.search(query)] == baseline(query)
+    assert catalog.search("call of dutty black ops", fuzzy=True)
+    assert catalog.search("x" * 20000 + "".join(map(chr, range(0x4e00, 0x4e00 + 20000)))) == []
+    db.close()
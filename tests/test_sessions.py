@@ -0,0 +1,54 @@
+import time
+from datetime import timedelta
+
+import pytest
+from flask import Flask, session
+
+from sessions import SqliteSessionInterface, init_session
+
+
+def make_app(tmp_path, **config):
+    app = Flask(__name__)
+    app.config.update(SESSION_DATABASE=str(tmp_path / "sessions.db"), SESSION_TYPE="filesystem",
+                      SESSION_FILE_DIR=str(tmp_path / "files"), **config)
+    init_session(app)
+
+    @app.route("/login")
+    def login():
+        session["user_id"] = 1
+        return ""
+
+    @app.route("/me")
+    def me():
+        return str(session.get("user_id"))
+
+    return app
+
+
+def test_cookie_backend_needs_secret_key(tmp_path):
+    with pytest.raises(RuntimeError):
+        make_app(tmp_path, SESSION_BACKEND="cookie")
+    make_app(tmp_path, SESSION_BACKEND="cookie", SECRET_KEY="test")
+
+
+def test_default_backend_is_server_side(tmp_path):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    client.get("/login")
+    assert client.get("/me").text == "1"
+
+
+def test_sqlite_session_expiry_moves_on_access(tmp_path):
+    app = make_app(tmp_path, SESSION_BACKEND="sqlite", SESSION_IDLE_TIMEOUT=timedelta(seconds=120))
+    interface = app.session_interface
+    assert isinstance(interface, SqliteSessionInterface)
+    interface.refresh_interval = 0
+    client = app.test_client()
+    client.get("/login")
+
+    connection = interface._connect()
+    with connection:
+        connection.execute("UPDATE sessions SET expires = ?", (time.time() + 1,))
+    assert client.get("/me").text == "1"
+    (expires,) = connection.execute("SELECT expires FROM sessions").fetchone()
+    assert expires > time.time() + 100
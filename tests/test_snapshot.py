@@ -0,0 +1,33 @@
+import sqlite3
+
+from catalog import GameRepository
+from database import Database
+from snapshot import CatalogSnapshot, build_snapshot
+
+
+def fields(game):
+    return game.id, game.name, game.cpu, game.gpu, game.ram, game.cpu_tier, game.gpu_tier
+
+
+def test_snapshot_matches_table(database, tmp_path):
+    db = Database(database)
+    path = str(tmp_path / "catalog.snapshot")
+    build_snapshot(db, path)
+    snapshot = CatalogSnapshot(path)
+    assert list(map(fields, snapshot.games(range(len(snapshot))))) == list(map(fields, GameRepository(db).all()))
+    db.close()
+
+
+def test_build_does_not_wait_for_writer(database, tmp_path):
+    db = Database(database, busy_timeout=100)
+    writer = sqlite3.connect(database, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("UPDATE games SET ram = ram + 1")
+    try:
+        build_snapshot(db, str(tmp_path / "catalog.snapshot"))       # lee la version confirmada, sin el lock de escritura
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    snapshot = CatalogSnapshot(str(tmp_path / "catalog.snapshot"))
+    assert list(snapshot.columns["ram"]) == [game.ram for game in GameRepository(db).all()]
+    db.close()